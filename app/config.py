@@ -29,6 +29,16 @@ class Settings(BaseSettings):
     cloud_tasks_queue: str = "indexing"
     task_handler_base_url: str = "http://localhost:8080"
     cors_origins: str = ""
+    # Retrieval result cache (0 disables)
+    retrieval_cache_ttl_seconds: float = 300.0
+    retrieval_cache_max_entries: int = 1024
+    # Start the trigram fallback concurrently with FTS on its own session.
+    # Off by default: each chat request then holds a second pooled connection.
+    retrieval_speculative_trigram: bool = False
+    # Also start the OR fallback speculatively (a third connection; needs the above)
+    retrieval_speculative_or: bool = False
+    # Run the FTS/OR/trigram cascade as one CTE statement (retrieve_chunks_sql)
+    retrieval_single_query: bool = False
 
 
 settings = Settings()
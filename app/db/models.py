@@ -69,8 +69,15 @@ class KBChunk(Base):
     start_line: Mapped[int]
     end_line: Mapped[int]
     content: Mapped[str] = mapped_column(Text)
+    # Path terms (weight A) outrank body terms (weight B) under ts_rank_cd.
+    # Must match migrations/versions/002_weighted_content_tsv.py.
     content_tsv: Mapped[str] = mapped_column(
-        TSVECTOR, Computed("to_tsvector('english', content)", persisted=True)
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', translate(path, '/.-', '   ')), 'A') || "
+            "setweight(to_tsvector('english', content), 'B')",
+            persisted=True,
+        ),
     )
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
 
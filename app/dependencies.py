@@ -1,11 +1,20 @@
 """Centralized FastAPI dependencies for use with Depends()."""
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.db import engine as _engine
 from app.db.session import get_db_session
 from app.services.gemini_client import InMemoryLLMClient, LLMClient
+from app.services.query_cache import RetrievalCache
 from app.services.task_queue import InMemoryTaskQueue, TaskQueue
 
 _task_queue: TaskQueue = InMemoryTaskQueue()
 _gemini_client: LLMClient = InMemoryLLMClient()
+_retrieval_cache = RetrievalCache(
+    ttl_seconds=settings.retrieval_cache_ttl_seconds,
+    max_entries=settings.retrieval_cache_max_entries,
+)
 
 
 def init_production_deps(
@@ -45,9 +54,30 @@ def get_gemini_client() -> LLMClient:
     return _gemini_client
 
 
+def get_retrieval_cache() -> RetrievalCache:
+    """Return the process-wide retrieval result cache.
+
+    Sized and expired according to ``settings.retrieval_cache_*``.
+    """
+    return _retrieval_cache
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession] | None:
+    """Return the session factory for extra concurrent queries, if enabled.
+
+    None when ``settings.retrieval_speculative_trigram`` is off or the engine
+    has not been initialized; callers then fall back to a single session.
+    """
+    if not settings.retrieval_speculative_trigram:
+        return None
+    return _engine.async_session_factory
+
+
 __all__ = [
     "get_db_session",
     "get_gemini_client",
+    "get_retrieval_cache",
+    "get_session_factory",
     "get_task_queue",
     "init_production_deps",
 ]
@@ -18,7 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
 from app.db.models import KBChunk, KBFile
 from app.db.session import get_db_session
-from app.dependencies import get_task_queue
+from app.dependencies import get_retrieval_cache, get_task_queue
 from app.schemas.admin import (
     BackfillRepoResult,
     BackfillRequest,
@@ -32,6 +32,8 @@ from app.schemas.tasks import IndexFilePayload
 from app.services.chunker import chunk_file
 from app.services.denylist import is_denied
 from app.services.github_client import get_repo_metadata, list_repo_files
+from app.services.indexer import bulk_insert_chunks
+from app.services.query_cache import RetrievalCache
 from app.services.repo_manager import get_or_create_repo
 from app.services.task_queue import TaskQueue
 
@@ -41,27 +43,56 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 
 
 class _TextExtractor(HTMLParser):
-    """Minimal HTML-to-text extractor using stdlib html.parser."""
+    """Minimal HTML-to-text extractor using stdlib html.parser.
+
+    Safe to ``feed()`` incrementally: HTMLParser may report one text run as
+    several ``handle_data`` calls when it straddles a feed boundary, so text
+    is buffered until the next piece of markup (or ``close()``) ends the run.
+    """
 
     def __init__(self) -> None:
         super().__init__()
         self._pieces: list[str] = []
+        self._pending: list[str] = []
         self._skip = False
         self._skip_tags = {"script", "style", "noscript"}
 
+    def _flush(self) -> None:
+        if self._pending:
+            stripped = "".join(self._pending).strip()
+            self._pending.clear()
+            if stripped:
+                self._pieces.append(stripped)
+
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush()
         if tag in self._skip_tags:
             self._skip = True
 
     def handle_endtag(self, tag: str) -> None:
+        self._flush()
         if tag in self._skip_tags:
             self._skip = False
 
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush()
+
     def handle_data(self, data: str) -> None:
         if not self._skip:
-            stripped = data.strip()
-            if stripped:
-                self._pieces.append(stripped)
+            self._pending.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
 
     def get_text(self) -> str:
         return "\n".join(self._pieces)
@@ -71,6 +102,7 @@ def extract_text_from_html(html: str) -> str:
     """Extract visible text from HTML, stripping script/style tags."""
     parser = _TextExtractor()
     parser.feed(html)
+    parser.close()
     return parser.get_text()
 
 
@@ -214,15 +246,21 @@ async def backfill(
 async def ingest_url(
     request: IngestURLRequest,
     session: Annotated[AsyncSession, Depends(get_db_session)],
+    retrieval_cache: Annotated[RetrievalCache, Depends(get_retrieval_cache)],
 ) -> IngestURLResponse:
     """Fetch a web page and ingest its text content into the knowledge base."""
-    # Fetch URL content
-    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-        resp = await client.get(request.url)
+    # Stream the page into the extractor so the raw HTML is never held in
+    # memory as a whole; HTMLParser buffers any tag split across pieces.
+    parser = _TextExtractor()
+    async with (
+        httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client,
+        client.stream("GET", request.url) as resp,
+    ):
         resp.raise_for_status()
-
-    # Extract text from HTML
-    text = extract_text_from_html(resp.text)
+        async for piece in resp.aiter_text():
+            parser.feed(piece)
+    parser.close()
+    text = parser.get_text()
 
     # Derive path from URL if not provided
     path = request.path
@@ -262,19 +300,27 @@ async def ingest_url(
         session.add(kb_file)
         await session.flush()
 
-    # Chunk and create records
+    # Chunk and create records in one batched INSERT
     chunks = chunk_file(text, path)
-    for start_line, end_line, chunk_content in chunks:
-        chunk = KBChunk(
-            repo_id=synthetic_id,
-            file_id=kb_file.id,
-            path=path,
-            commit_sha=commit_sha,
-            start_line=start_line,
-            end_line=end_line,
-            content=chunk_content,
-        )
-        session.add(chunk)
+    await bulk_insert_chunks(
+        session,
+        [
+            {
+                "repo_id": synthetic_id,
+                "file_id": kb_file.id,
+                "path": path,
+                "commit_sha": commit_sha,
+                "start_line": start_line,
+                "end_line": end_line,
+                "content": chunk_content,
+            }
+            for start_line, end_line, chunk_content in chunks
+        ],
+    )
+
+    # Commit before invalidating so chat cannot re-cache the old chunks.
+    await session.commit()
+    retrieval_cache.clear()
 
     logger.info(
         "url_ingested",
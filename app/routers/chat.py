@@ -11,10 +11,12 @@ from typing import Annotated
 
 import structlog
 from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession  # noqa: TC002
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker  # noqa: TC002
 
+from app.config import settings
 from app.db.session import get_db_session
-from app.dependencies import get_gemini_client
+from app.dependencies import get_gemini_client, get_retrieval_cache, get_session_factory
 from app.schemas.chat import (
     ChatRequest,
     ChatResponse,
@@ -23,7 +25,13 @@ from app.schemas.chat import (
     LLMResponse,
 )
 from app.services.gemini_client import SYSTEM_PROMPT, LLMClient
-from app.services.retrieval import RetrievedChunk, has_any_chunks, retrieve_chunks
+from app.services.query_cache import RetrievalCache  # noqa: TC001
+from app.services.retrieval import (
+    RetrievedChunk,
+    has_any_chunks,
+    retrieve_chunks,
+    retrieve_chunks_sql,
+)
 
 logger = structlog.get_logger()
 
@@ -50,6 +58,14 @@ def compute_confidence(
     return "low"
 
 
+def _citation_source(chunk: RetrievedChunk) -> str:
+    """Return the ``owner/repo/path@sha:start_line-end_line`` source string."""
+    return (
+        f"{chunk.repo_owner}/{chunk.repo_name}/{chunk.path}"
+        f"@{chunk.commit_sha}:{chunk.start_line}-{chunk.end_line}"
+    )
+
+
 def build_context(chunks: list[RetrievedChunk]) -> str:
     """Format retrieved chunks into context string for the LLM.
 
@@ -57,15 +73,43 @@ def build_context(chunks: list[RetrievedChunk]) -> str:
     the SYSTEM_PROMPT's documented chunk header format.  The owner prefix
     is included for disambiguation across multiple repos with the same name.
     """
-    parts: list[str] = []
-    for chunk in chunks:
-        header = (
-            f"--- CHUNK: {chunk.repo_owner}/{chunk.repo_name}/"
-            f"{chunk.path}@{chunk.commit_sha}:"
-            f"{chunk.start_line}-{chunk.end_line} ---"
+    return "\n\n".join(
+        f"--- CHUNK: {_citation_source(chunk)} ---\n{chunk.content}" for chunk in chunks
+    )
+
+
+def parse_llm_response(raw: str | None) -> LLMResponse | None:
+    """Parse and validate the LLM's raw JSON in a single pass.
+
+    ``model_validate_json`` hands the bytes straight to pydantic-core, which
+    parses and validates without building an intermediate dict.  Returns
+    ``None`` (after logging) when the output is missing or not a valid
+    LLMResponse.
+    """
+    if raw is None:
+        logger.warning("llm_response_empty")
+        return None
+    try:
+        return LLMResponse.model_validate_json(raw)
+    except ValidationError as exc:
+        logger.warning(
+            "llm_response_invalid",
+            error_count=exc.error_count(),
+            raw_length=len(raw),
         )
-        parts.append(f"{header}\n{chunk.content}")
-    return "\n\n".join(parts)
+        return None
+
+
+def _error_response() -> ChatResponse:
+    """Graceful reply used when the LLM call or its output fails."""
+    return ChatResponse(
+        answer=(
+            "I'm sorry, I encountered an error processing your question. "
+            "Please try again."
+        ),
+        citations=[],
+        confidence="low",
+    )
 
 
 def verify_citations(
@@ -76,13 +120,10 @@ def verify_citations(
 
     Drops any hallucinated citations whose source string does not match a
     retrieved chunk.  Citation source format:
-    ``owner/repo/path@sha:start_line-end_line``.
+    ``owner/repo/path@sha:start_line-end_line``.  Sources are built once
+    per chunk into a frozenset, so each citation check is a hash lookup.
     """
-    valid_sources = {
-        f"{c.repo_owner}/{c.repo_name}/{c.path}@{c.commit_sha}:"
-        f"{c.start_line}-{c.end_line}"
-        for c in chunks
-    }
+    valid_sources = frozenset(map(_citation_source, chunks))
     return [
         Citation(source=cit.source, relevance=cit.relevance)
         for cit in llm_citations
@@ -98,19 +139,36 @@ async def chat(
     request: ChatRequest,
     session: Annotated[AsyncSession, Depends(get_db_session)],
     llm_client: Annotated[LLMClient, Depends(get_gemini_client)],
+    retrieval_cache: Annotated[RetrievalCache, Depends(get_retrieval_cache)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession] | None, Depends(get_session_factory)
+    ],
 ) -> ChatResponse:
     """Answer a question using the RAG pipeline.
 
     Orchestration order:
-    1. Retrieve relevant chunks from the knowledge base.
+    1. Retrieve relevant chunks from the knowledge base (or the cache).
     2. Compute confidence from retrieval signals.
     3. Build context string from chunks.
     4. Call LLM with system prompt and context.
     5. Verify citations against retrieved chunks.
     6. Return structured response.
     """
-    # 1. Retrieve chunks
-    chunks = await retrieve_chunks(session, request.question)
+
+    # 1. Retrieve chunks, reusing a recent (or in-flight) result for the same
+    # question.  Empty results are not cached so newly indexed content shows
+    # up at once.
+    async def load() -> list[RetrievedChunk]:
+        if settings.retrieval_single_query:
+            return await retrieve_chunks_sql(session, request.question)
+        return await retrieve_chunks(
+            session,
+            request.question,
+            session_factory=session_factory,
+            speculative_or=settings.retrieval_speculative_or,
+        )
+
+    chunks = await retrieval_cache.get_or_load(request.question, load)
 
     # 2. Handle empty retrieval
     if not chunks:
@@ -138,24 +196,21 @@ async def chat(
     # 4. Build context string
     context = build_context(chunks)
 
-    # 5-6. Call LLM and parse response
+    # 5. Call LLM
     try:
         raw = await llm_client.generate(
             system_prompt=SYSTEM_PROMPT,
             user_content=f"Context:\n{context}\n\nQuestion: {request.question}",
             response_schema=LLMResponse,
         )
-        llm_response = LLMResponse.model_validate_json(raw)
     except Exception:
         logger.exception("llm_generation_failed")
-        return ChatResponse(
-            answer=(
-                "I'm sorry, I encountered an error processing your question. "
-                "Please try again."
-            ),
-            citations=[],
-            confidence="low",
-        )
+        return _error_response()
+
+    # 6. Parse response
+    llm_response = parse_llm_response(raw)
+    if llm_response is None:
+        return _error_response()
 
     # 7. Verify citations
     verified = verify_citations(llm_response.citations, chunks)
@@ -13,8 +13,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.db.session import get_db_session
+from app.dependencies import get_retrieval_cache
 from app.schemas.tasks import DeleteFilePayload, IndexFilePayload
 from app.services.indexer import delete_file, index_file
+from app.services.query_cache import RetrievalCache
 
 logger = structlog.get_logger()
 
@@ -25,10 +27,13 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 async def handle_index_file(
     payload: IndexFilePayload,
     session: Annotated[AsyncSession, Depends(get_db_session)],
+    retrieval_cache: Annotated[RetrievalCache, Depends(get_retrieval_cache)],
 ) -> dict:
     """Process an index-file task: fetch, filter, chunk, and upsert.
 
     Called by the task queue for each added or modified file in a push event.
+    Commits before clearing the retrieval cache, so chat cannot re-cache
+    chunks from before the change.
     """
     try:
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -48,6 +53,8 @@ async def handle_index_file(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to index file: {payload.path}",
         ) from None
+    await session.commit()
+    retrieval_cache.clear()
     return result
 
 
@@ -55,10 +62,12 @@ async def handle_index_file(
 async def handle_delete_file(
     payload: DeleteFilePayload,
     session: Annotated[AsyncSession, Depends(get_db_session)],
+    retrieval_cache: Annotated[RetrievalCache, Depends(get_retrieval_cache)],
 ) -> dict:
     """Process a delete-file task: remove the file and its chunks.
 
     Called by the task queue for each removed file in a push event.
+    Clears the retrieval cache once the deletion is committed.
     """
     try:
         result = await delete_file(
@@ -72,4 +81,6 @@ async def handle_delete_file(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete file: {payload.path}",
         ) from None
+    await session.commit()
+    retrieval_cache.clear()
     return result
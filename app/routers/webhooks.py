@@ -1,7 +1,7 @@
 """GitHub webhook router with HMAC-SHA256 signature verification."""
 
-import hashlib
 import hmac
+from functools import lru_cache
 from typing import Annotated
 
 import structlog
@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 from app.config import settings
 from app.dependencies import get_task_queue
 from app.schemas.tasks import DeleteFilePayload, IndexFilePayload
-from app.schemas.webhooks import PushWebhookPayload
+from app.schemas.webhooks import PushWebhookPayload, WebhookAcceptedResponse
 from app.services.task_queue import TaskQueue
 
 logger = structlog.get_logger()
@@ -18,6 +18,37 @@ logger = structlog.get_logger()
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
+@lru_cache(maxsize=4)
+def _hmac_prototype(secret: str) -> hmac.HMAC:
+    """Return a keyed, empty HMAC-SHA256 to ``copy()`` for each request.
+
+    Keying pads the secret and hashes the inner/outer key blocks; copying a
+    pre-keyed object skips that work on every webhook.  Keyed by the secret
+    so a changed setting never reuses a stale prototype.
+    """
+    return hmac.new(secret.encode("utf-8"), digestmod="sha256")
+
+
+_SIGNATURE_PREFIX = "sha256="
+_SIGNATURE_HEX_LEN = 64
+
+
+def _parse_signature(header: str) -> bytes | None:
+    """Decode a ``sha256=<hex>`` header to its raw 32-byte digest.
+
+    Returns None for anything malformed (wrong prefix, length, or non-hex).
+    """
+    if not header.startswith(_SIGNATURE_PREFIX):
+        return None
+    hex_digest = header[len(_SIGNATURE_PREFIX) :]
+    if len(hex_digest) != _SIGNATURE_HEX_LEN:
+        return None
+    try:
+        return bytes.fromhex(hex_digest)
+    except ValueError:
+        return None
+
+
 async def verify_github_signature(
     request: Request,
     x_hub_signature_256: str = Header(...),
@@ -25,21 +56,20 @@ async def verify_github_signature(
     """Verify GitHub webhook HMAC-SHA256 signature.
 
     Reads the raw request body, computes the expected signature using the
-    configured webhook secret, and performs a constant-time comparison.
+    configured webhook secret, and performs a constant-time comparison of
+    the raw digests.
 
     Returns the raw body bytes on success so the route handler can parse
     the payload without reading the body stream a second time.
 
     Raises:
-        HTTPException: 401 if signature does not match.
+        HTTPException: 401 if signature is malformed or does not match.
     """
     body = await request.body()
-    expected = "sha256=" + hmac.new(
-        settings.github_webhook_secret.encode("utf-8"),
-        msg=body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    if not hmac.compare_digest(expected, x_hub_signature_256):
+    provided = _parse_signature(x_hub_signature_256)
+    mac = _hmac_prototype(settings.github_webhook_secret).copy()
+    mac.update(body)
+    if provided is None or not hmac.compare_digest(mac.digest(), provided):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid signature",
@@ -51,17 +81,18 @@ async def verify_github_signature(
 async def github_webhook(
     raw_body: bytes = Depends(verify_github_signature),
     task_queue: Annotated[TaskQueue, Depends(get_task_queue)] = None,  # type: ignore[assignment]
-) -> dict:
+) -> WebhookAcceptedResponse:
     """Receive a GitHub push webhook event.
 
     Parses the payload and enqueues index/delete tasks for each file
-    mentioned in the push commits.
+    mentioned in the push commits.  The raw body is parsed straight into the
+    model by pydantic-core, without an intermediate dict.
     """
     payload = PushWebhookPayload.model_validate_json(raw_body)
 
     if payload.deleted:
         logger.info("webhook_skipped_deletion", ref=payload.ref)
-        return {"status": "accepted", "tasks_enqueued": 0}
+        return WebhookAcceptedResponse(tasks_enqueued=0)
 
     base_url = settings.task_handler_base_url
     repo = payload.repository
@@ -103,4 +134,4 @@ async def github_webhook(
             tasks_enqueued += 1
 
     logger.info("webhook_processed", commits=len(payload.commits), tasks_enqueued=tasks_enqueued)
-    return {"status": "accepted", "tasks_enqueued": tasks_enqueued}
+    return WebhookAcceptedResponse(tasks_enqueued=tasks_enqueued)
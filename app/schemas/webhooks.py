@@ -54,3 +54,10 @@ class PushWebhookPayload(BaseModel):
     created: bool = False
     deleted: bool = False
     forced: bool = False
+
+
+class WebhookAcceptedResponse(BaseModel):
+    """Response body for POST /webhooks/github."""
+
+    status: str = "accepted"
+    tasks_enqueued: int
@@ -7,6 +7,7 @@ no semantic boundaries are detected.
 
 import os
 import re
+from bisect import bisect_left
 
 # Regex patterns for detecting function/class boundaries per language.
 # Each pattern matches lines that typically start a new logical block.
@@ -38,11 +39,24 @@ BOUNDARY_PATTERNS: dict[str, re.Pattern[str]] = {
     ),
 }
 
-# ATX heading pattern for markdown splitting.
-_HEADING_PATTERN = re.compile(r"^#{1,6}\s+", re.MULTILINE)
+# ATX heading pattern for markdown splitting.  Scanned over the whole
+# document in one pass; ``[^\S\n]`` keeps the whitespace after the hashes on
+# the heading line itself, matching a per-line ``#{1,6}\s+`` check.
+_HEADING_PATTERN = re.compile(r"^#{1,6}[^\S\n]", re.MULTILINE)
 
 
-def chunk_markdown(content: str) -> list[tuple[int, int, str]]:
+def _newline_offsets(content: str) -> list[int]:
+    """Return the character offset of every newline in content, in order.
+
+    The 0-indexed line of any offset is ``bisect_left(offsets, offset)``,
+    so one scan serves every line-number lookup for the file.
+    """
+    return [m.start() for m in re.finditer("\n", content)]
+
+
+def chunk_markdown(
+    content: str, newline_offsets: list[int] | None = None
+) -> list[tuple[int, int, str]]:
     """Split markdown content at ATX heading boundaries.
 
     Each heading starts a new chunk. Content before the first heading
@@ -50,6 +64,8 @@ def chunk_markdown(content: str) -> list[tuple[int, int, str]]:
 
     Args:
         content: Raw markdown text.
+        newline_offsets: Precomputed ``_newline_offsets(content)``; built on
+            demand when omitted.
 
     Returns:
         List of (start_line, end_line, chunk_text) tuples with 1-indexed lines.
@@ -57,21 +73,30 @@ def chunk_markdown(content: str) -> list[tuple[int, int, str]]:
     if not content or not content.strip():
         return []
 
-    lines = content.split("\n")
-    chunks: list[tuple[int, int, str]] = []
-    current_start = 0  # 0-indexed
+    if newline_offsets is None:
+        newline_offsets = _newline_offsets(content)
 
-    for i, line in enumerate(lines):
-        if _HEADING_PATTERN.match(line) and i > 0:
-            chunk_text = "\n".join(lines[current_start:i])
-            if chunk_text.strip():
-                chunks.append((current_start + 1, i, chunk_text))
-            current_start = i
+    chunks: list[tuple[int, int, str]] = []
+    current_offset = 0  # character offset of the current chunk start
+    current_line = 1  # 1-indexed line of the current chunk start
+
+    for match in _HEADING_PATTERN.finditer(content):
+        offset = match.start()
+        if offset == 0:
+            continue
+        # The chunk ends on the line before the heading; drop its trailing newline
+        line = bisect_left(newline_offsets, offset) + 1
+        chunk_text = content[current_offset : offset - 1]
+        if chunk_text.strip():
+            chunks.append((current_line, line - 1, chunk_text))
+        current_offset = offset
+        current_line = line
 
     # Final chunk from last boundary to end of file
-    chunk_text = "\n".join(lines[current_start:])
+    chunk_text = content[current_offset:]
     if chunk_text.strip():
-        chunks.append((current_start + 1, len(lines), chunk_text))
+        total_lines = len(newline_offsets) + 1
+        chunks.append((current_line, total_lines, chunk_text))
 
     return chunks
 
@@ -81,6 +106,7 @@ def chunk_code(
     ext: str,
     min_lines: int = 200,
     max_lines: int = 400,
+    newline_offsets: list[int] | None = None,
 ) -> list[tuple[int, int, str]]:
     """Split code content at function/class boundaries with fallback.
 
@@ -94,6 +120,8 @@ def chunk_code(
         ext: File extension including the dot (e.g. ".py", ".js").
         min_lines: Minimum desired chunk size in lines (for merging).
         max_lines: Maximum chunk size in lines (for splitting).
+        newline_offsets: Precomputed ``_newline_offsets(content)``; built on
+            demand when boundaries need mapping to lines.
 
     Returns:
         List of (start_line, end_line, chunk_text) tuples with 1-indexed lines.
@@ -113,10 +141,10 @@ def chunk_code(
     # Find boundary line numbers (0-indexed)
     boundary_indices: list[int] = []
     if pattern is not None:
+        if newline_offsets is None:
+            newline_offsets = _newline_offsets(content)
         for match in pattern.finditer(content):
-            pos = match.start()
-            line_num = content[:pos].count("\n")
-            boundary_indices.append(line_num)
+            boundary_indices.append(bisect_left(newline_offsets, match.start()))
 
     # No boundaries found or unknown extension: fall back to line-based chunks
     if not boundary_indices:
@@ -137,6 +165,26 @@ def chunk_code(
     return result
 
 
+def _chunk_markdown_file(
+    content: str,
+    ext: str,
+    min_lines: int = 200,
+    max_lines: int = 400,
+    newline_offsets: list[int] | None = None,
+) -> list[tuple[int, int, str]]:
+    """Adapt chunk_markdown to the chunk_code signature used by _DISPATCH."""
+    return chunk_markdown(content, newline_offsets=newline_offsets)
+
+
+# Extension -> chunker. Every entry takes chunk_code's signature so
+# chunk_file can call whichever one matches without branching; anything
+# not listed is handled by chunk_code.
+_DISPATCH = {
+    ".md": _chunk_markdown_file,
+    ".mdx": _chunk_markdown_file,
+}
+
+
 def chunk_file(
     content: str,
     path: str,
@@ -146,7 +194,8 @@ def chunk_file(
     """Dispatch to the correct chunker based on file extension.
 
     Routes .md and .mdx files to chunk_markdown, everything else
-    to chunk_code.
+    to chunk_code. The newline offset index is built once here and shared
+    with whichever chunker runs.
 
     Args:
         content: Raw file content.
@@ -157,13 +206,14 @@ def chunk_file(
     Returns:
         List of (start_line, end_line, chunk_text) tuples with 1-indexed lines.
     """
-    _, ext = os.path.splitext(path)
-    ext_lower = ext.lower()
-
-    if ext_lower in (".md", ".mdx"):
-        return chunk_markdown(content)
-
-    return chunk_code(content, ext_lower, min_lines=min_lines, max_lines=max_lines)
+    ext = os.path.splitext(path)[1].lower()
+    return _DISPATCH.get(ext, chunk_code)(
+        content,
+        ext,
+        min_lines=min_lines,
+        max_lines=max_lines,
+        newline_offsets=_newline_offsets(content),
+    )
 
 
 def _fallback_chunks(
@@ -221,21 +271,19 @@ def _merge_and_split(
 
     Operates on 0-indexed half-open intervals [start, end).
     """
-    # Phase 1: Merge small chunks with their successor
+    # Phase 1: Merge small chunks with their successors in one sweep.  The
+    # accumulator starts at a chunk's start and is flushed as soon as it
+    # spans min_lines; a short tail is flushed as-is.
     merged: list[tuple[int, int]] = []
-    i = 0
-    while i < len(chunks):
-        start, end = chunks[i]
-        size = end - start
-
-        # Merge forward while the current accumulated chunk is below min_lines
-        while size < min_lines and i + 1 < len(chunks):
-            i += 1
-            _, end = chunks[i]
-            size = end - start
-
-        merged.append((start, end))
-        i += 1
+    acc_start: int | None = None
+    for start, end in chunks:
+        if acc_start is None:
+            acc_start = start
+        if end - acc_start >= min_lines:
+            merged.append((acc_start, end))
+            acc_start = None
+    if acc_start is not None:
+        merged.append((acc_start, chunks[-1][1]))
 
     # Phase 2: Sub-split any chunk that exceeds max_lines
     result: list[tuple[int, int]] = []
@@ -4,10 +4,8 @@ Filters out binary files, junk directories, lock files, and oversized files
 before they reach the chunking and indexing pipeline.
 """
 
-import fnmatch
-
 # Directory path segments that indicate junk/non-indexable content.
-# Matching is done by checking if the segment appears anywhere in the path.
+# A path is denied if any of its directory components equals one of these.
 DENYLIST_DIRS: list[str] = [
     "node_modules/",
     "dist/",
@@ -20,6 +18,9 @@ DENYLIST_DIRS: list[str] = [
     ".mypy_cache/",
 ]
 
+# Bare directory names for a single set-membership check per path component.
+_DENIED_DIR_NAMES: frozenset[str] = frozenset(d.rstrip("/") for d in DENYLIST_DIRS)
+
 # Glob patterns for file extensions that should never be indexed.
 DENYLIST_EXTENSIONS: list[str] = [
     "*.lock",
@@ -47,6 +48,11 @@ DENYLIST_EXTENSIONS: list[str] = [
     "*.map",
 ]
 
+# Every extension pattern is "*" plus a literal suffix, so the whole list
+# collapses to one str.endswith() call (composite suffixes like ".tar.gz"
+# included) instead of an fnmatch per pattern.
+_DENIED_SUFFIXES: tuple[str, ...] = tuple(p.removeprefix("*") for p in DENYLIST_EXTENSIONS)
+
 # Exact filenames that should be rejected regardless of directory.
 DENYLIST_FILES: list[str] = [
     "package-lock.json",
@@ -59,6 +65,8 @@ DENYLIST_FILES: list[str] = [
     "composer.lock",
 ]
 
+_DENIED_FILENAMES: frozenset[str] = frozenset(DENYLIST_FILES)
+
 # Files larger than this threshold (in bytes) are rejected.
 MAX_FILE_SIZE_BYTES: int = 500_000  # 500 KB
 
@@ -74,23 +82,21 @@ def is_denied(path: str, size_bytes: int | None = None) -> bool:
     Returns:
         True if the file should be skipped, False if it should be indexed.
     """
-    # Normalise path to always have a leading slash for consistent matching
-    normalised = f"/{path}"
+    # Checks run cheapest first so most rejections exit early.
+    # Check file size threshold
+    if size_bytes is not None and size_bytes > MAX_FILE_SIZE_BYTES:
+        return True
 
-    # Check directory patterns
-    for dir_pattern in DENYLIST_DIRS:
-        if f"/{dir_pattern}" in normalised:
-            return True
+    dir_part, _, filename = path.rpartition("/")
 
-    # Check extension patterns against the filename only
-    filename = path.rsplit("/", maxsplit=1)[-1]
-    for ext_pattern in DENYLIST_EXTENSIONS:
-        if fnmatch.fnmatch(filename, ext_pattern):
-            return True
+    # Check exact filename matches (hashed lookup on the basename)
+    if filename in _DENIED_FILENAMES:
+        return True
 
-    # Check exact filename matches
-    if filename in DENYLIST_FILES:
+    # Check extension patterns against the filename only
+    if filename.endswith(_DENIED_SUFFIXES):
         return True
 
-    # Check file size threshold
-    return size_bytes is not None and size_bytes > MAX_FILE_SIZE_BYTES
+    # Check directory components in one set lookup instead of a substring
+    # scan per denied directory; the directory part is only split if needed
+    return bool(dir_part) and not _DENIED_DIR_NAMES.isdisjoint(dir_part.split("/"))
@@ -77,15 +77,20 @@ class GeminiClient:
         return response.text
 
 
+# Canned LLMResponse JSON returned by InMemoryLLMClient until a test sets
+# ``response``; built once and shared by every instance.
+_DEFAULT_RESPONSE = (
+    '{"answer":"test answer","citations":[],'
+    '"needs_clarification":false,"clarifying_question":null}'
+)
+
+
 class InMemoryLLMClient:
     """Test double that records calls and returns canned responses."""
 
     def __init__(self) -> None:
         self.calls: list[dict] = []
-        self.response: str = (
-            '{"answer":"test answer","citations":[],'
-            '"needs_clarification":false,"clarifying_question":null}'
-        )
+        self.response: str = _DEFAULT_RESPONSE
 
     async def generate(
         self, system_prompt: str, user_content: str, response_schema: type
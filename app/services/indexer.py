@@ -8,7 +8,7 @@ and updates to existing files, as well as file deletion.
 import hashlib
 
 import structlog
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models import KBChunk, KBFile
@@ -20,6 +20,21 @@ from app.services.repo_manager import get_or_create_repo
 logger = structlog.get_logger()
 
 
+async def bulk_insert_chunks(session: AsyncSession, rows: list[dict]) -> None:
+    """Insert KBChunk rows with a single executemany INSERT.
+
+    Avoids building one ORM object (and one unit-of-work entry) per chunk;
+    SQLAlchemy batches the parameter sets into multi-row VALUES statements.
+
+    Args:
+        session: Async database session for DB operations.
+        rows: Column-name -> value mappings, one per chunk.
+    """
+    if not rows:
+        return
+    await session.execute(insert(KBChunk), rows)
+
+
 async def index_file(
     session: AsyncSession,
     github_client: object,
@@ -111,18 +126,22 @@ async def index_file(
     # Step 6: Chunk the content
     chunks = chunk_file(content, path)
 
-    # Step 7: Create KBChunk records
-    for start_line, end_line, chunk_content in chunks:
-        chunk = KBChunk(
-            repo_id=repo_id,
-            file_id=kb_file.id,
-            path=path,
-            commit_sha=commit_sha,
-            start_line=start_line,
-            end_line=end_line,
-            content=chunk_content,
-        )
-        session.add(chunk)
+    # Step 7: Create KBChunk records in one batched INSERT
+    await bulk_insert_chunks(
+        session,
+        [
+            {
+                "repo_id": repo_id,
+                "file_id": kb_file.id,
+                "path": path,
+                "commit_sha": commit_sha,
+                "start_line": start_line,
+                "end_line": end_line,
+                "content": chunk_content,
+            }
+            for start_line, end_line, chunk_content in chunks
+        ],
+    )
 
     logger.info("file_indexed", path=path, chunks=len(chunks))
     return {"status": "indexed", "chunks": len(chunks)}
@@ -0,0 +1,136 @@
+"""In-process cache of retrieval results keyed by normalized question text.
+
+Repeated and FAQ-style questions ("what is this project?") hit the same
+FTS/trigram queries over and over.  ``RetrievalCache`` short-circuits those
+lookups for a bounded time window: entries expire after ``ttl_seconds`` so
+re-indexed content is picked up, and the least recently used entry is evicted
+once ``max_entries`` is reached.
+
+Questions are normalized (case-folded, whitespace collapsed) before lookup,
+so trivially different phrasings of the same text share an entry.
+``get_or_load`` also collapses concurrent misses for the same question onto a
+single in-flight load, so a burst of identical questions costs one retrieval.
+
+The routes that write to the knowledge base call ``clear()`` once their
+changes are committed, so this process never serves chunks from before a
+re-index.  Other instances still catch up within ``ttl_seconds``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from app.services.retrieval import RetrievedChunk
+
+
+def normalize_question(question: str) -> str:
+    """Return the cache key for a question: case-folded, single-spaced."""
+    return " ".join(question.casefold().split())
+
+
+class RetrievalCache:
+    """TTL + LRU cache mapping normalized questions to retrieved chunks."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[RetrievedChunk]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[list[RetrievedChunk]]] = {}
+        # Bumped by clear(); loads that started earlier are not stored.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, question: str) -> list[RetrievedChunk] | None:
+        """Return cached chunks for the question, or None on a miss or expiry."""
+        key = normalize_question(question)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, chunks = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return chunks
+
+    def put(self, question: str, chunks: list[RetrievedChunk]) -> None:
+        """Store chunks for the question, evicting the LRU entry when full."""
+        if self._max_entries <= 0 or self._ttl <= 0:
+            return
+        key = normalize_question(question)
+        self._entries[key] = (self._clock() + self._ttl, chunks)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        question: str,
+        load: Callable[[], Awaitable[list[RetrievedChunk]]],
+    ) -> list[RetrievedChunk]:
+        """Return cached chunks, or run *load* once for all concurrent callers.
+
+        The first caller to miss runs *load*; callers arriving while it is in
+        flight await the same result (or exception).  Non-empty results are
+        stored; empty ones are shared with waiters but not cached, so newly
+        indexed content shows up at once.  If the loading caller is
+        cancelled, waiters retry the load themselves.
+        """
+        cached = self.get(question)
+        if cached is not None:
+            return cached
+
+        key = normalize_question(question)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this waiter was cancelled, not the load
+                return await self.get_or_load(question, load)
+
+        future: asyncio.Future[list[RetrievedChunk]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            chunks = await load()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.set_result(chunks)
+        if chunks and generation == self._generation:
+            self.put(question, chunks)
+        return chunks
+
+    def clear(self) -> None:
+        """Drop every cached entry and forget in-flight loads.
+
+        Loads already running still answer their callers but are not stored,
+        since they may have read the knowledge base before the change.
+        """
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
@@ -7,23 +7,31 @@ on file paths as a fallback when FTS returns too few results.
 
 from __future__ import annotations
 
+import asyncio
 import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from typing import TYPE_CHECKING
 
-from sqlalchemy import func, select, text
+from sqlalchemy import exists, func, literal, select, text, union_all
 
 from app.db.models import KBChunk, KBFile, Repo
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncSession
+    from collections.abc import Awaitable, Callable
 
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class RetrievedChunk:
     """A retrieved chunk with all fields needed for citation building.
 
     Citation format: ``repo_owner/repo_name/path@commit_sha:start_line-end_line``
+
+    Immutable: instances are shared between requests via the retrieval cache.
     """
 
     id: int
@@ -47,7 +55,9 @@ async def search_fts(
     Uses ``websearch_to_tsquery`` (never ``to_tsquery``) to safely parse user
     input without syntax errors.  Results are ranked by cover density
     (``ts_rank_cd``), which considers term proximity -- ideal for code where
-    related terms cluster together.
+    related terms cluster together.  ``content_tsv`` indexes file-path terms
+    at weight A and body terms at weight B, so a chunk whose path matches the
+    query outranks one that only mentions the terms.
 
     Args:
         session: Async SQLAlchemy session.
@@ -160,17 +170,18 @@ async def search_trigram(
 _WORD_RE = re.compile(r"[a-zA-Z0-9_]+")
 
 
+@lru_cache(maxsize=4096)
 def _build_or_tsquery_text(query: str) -> str | None:
     """Extract unique words from *query* and join with OR (``|``) for tsquery.
 
     Returns ``None`` when no valid words remain (e.g. empty or all-punctuation).
     Input is sanitised to ``[a-zA-Z0-9_]`` only, so the result is safe for
-    ``to_tsquery``.
+    ``to_tsquery``.  Pure, so memoized: repeated questions skip the regex.
     """
-    words = list(dict.fromkeys(_WORD_RE.findall(query)))  # deduplicate, keep order
+    words = _WORD_RE.findall(query)
     if not words:
         return None
-    return " | ".join(words)
+    return " | ".join(dict.fromkeys(words))  # deduplicate, keep order
 
 
 async def search_fts_or(
@@ -228,10 +239,62 @@ async def search_fts_or(
     ]
 
 
+# How long a "no chunks yet" answer is reused before probing again.
+_HAS_ANY_FALSE_TTL = 2.0
+
+# (checked_at, value) of the last has_any_chunks probe, or None.
+_has_any_cache: tuple[float, bool] | None = None
+_clock = time.monotonic
+
+
+def reset_has_any_chunks_cache() -> None:
+    """Forget the cached ``has_any_chunks`` result."""
+    global _has_any_cache  # noqa: PLW0603
+    _has_any_cache = None
+
+
 async def has_any_chunks(session: AsyncSession) -> bool:
-    """Return True if the kb_chunks table has at least one row."""
+    """Return True if the kb_chunks table has at least one row.
+
+    Once the knowledge base has content it stays non-empty in practice, so a
+    True result is remembered for the life of the process.  A False result
+    is reused for ``_HAS_ANY_FALSE_TTL`` seconds, so the first indexed chunk
+    is noticed quickly without probing on every empty-retrieval request.
+    """
+    global _has_any_cache  # noqa: PLW0603
+    now = _clock()
+    if _has_any_cache is not None:
+        checked_at, value = _has_any_cache
+        if value or now - checked_at < _HAS_ANY_FALSE_TTL:
+            return value
+
     result = await session.execute(text("SELECT id FROM kb_chunks LIMIT 1"))
-    return result.first() is not None
+    value = result.first() is not None
+    _has_any_cache = (now, value)
+    return value
+
+
+# Head start given to FTS-AND before the speculative OR query is issued, so
+# queries that AND answers quickly never touch a second connection.
+_SPECULATIVE_OR_DELAY = 0.005
+
+
+async def _search_own_session(
+    session_factory: async_sessionmaker[AsyncSession],
+    search: Callable[..., Awaitable[list[RetrievedChunk]]],
+    query: str,
+    limit: int,
+    delay: float = 0.0,
+) -> list[RetrievedChunk]:
+    """Run a speculative *search* on a dedicated session, optionally delayed.
+
+    An ``AsyncSession`` cannot run two statements at once, so speculative
+    queries need their own session (and pooled connection).
+    """
+    if delay:
+        await asyncio.sleep(delay)
+    async with session_factory() as own_session:
+        return await search(own_session, query, limit=limit)
 
 
 async def retrieve_chunks(
@@ -239,6 +302,8 @@ async def retrieve_chunks(
     query: str,
     min_fts_results: int = 3,
     max_chunks: int = 12,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    speculative_or: bool = False,
 ) -> list[RetrievedChunk]:
     """Retrieve chunks: FTS-AND first, then OR fallback, then trigram.
 
@@ -247,27 +312,162 @@ async def retrieve_chunks(
     3. If still fewer than *min_fts_results*, also run trigram similarity.
     4. Merge results (deduplicated by chunk id), cap at *max_chunks*.
 
+    When *session_factory* is given, trigram runs speculatively on its own
+    session, starting up front; with *speculative_or* the OR fallback does
+    too, after a short head start for FTS-AND.  Each is cancelled as soon as
+    it is known not to be needed.  Without a factory the steps run
+    sequentially on *session*.
+
     Args:
         session: Async SQLAlchemy session.
         query: User's search query (plain text).
         min_fts_results: Trigger trigram fallback when FTS returns fewer than this.
         max_chunks: Maximum total chunks to return.
+        session_factory: Optional factory for the speculative fallback sessions.
+        speculative_or: Also start the OR fallback speculatively (needs a factory).
 
     Returns:
         List of RetrievedChunk, FTS results first then trigram, capped at max_chunks.
     """
-    results = await search_fts(session, query, limit=max_chunks)
+    or_task = trigram_task = None
+    if session_factory is not None:
+        trigram_task = asyncio.create_task(
+            _search_own_session(session_factory, search_trigram, query, max_chunks)
+        )
+        if speculative_or:
+            or_task = asyncio.create_task(
+                _search_own_session(
+                    session_factory, search_fts_or, query, max_chunks, _SPECULATIVE_OR_DELAY
+                )
+            )
+
+    try:
+        results = await search_fts(session, query, limit=max_chunks)
+
+        # OR fallback: only when AND returned zero results
+        if len(results) == 0:
+            if or_task is not None:
+                results = await or_task
+            else:
+                results = await search_fts_or(session, query, limit=max_chunks)
+
+        if len(results) < min_fts_results:
+            if trigram_task is not None:
+                trigram_results = await trigram_task
+            else:
+                trigram_results = await search_trigram(session, query, limit=max_chunks)
+            # Insertion-ordered dedupe: FTS chunks first, then unseen trigram ids.
+            by_id = {chunk.id: chunk for chunk in results}
+            for chunk in trigram_results:
+                if len(by_id) >= max_chunks:
+                    break
+                by_id.setdefault(chunk.id, chunk)
+            results = list(islice(by_id.values(), max_chunks))
+    finally:
+        # Drop speculative queries whose results turned out not to be needed,
+        # and collect every task's outcome (cancel() is a no-op on finished
+        # ones) so a failed query is never left as an unretrieved exception.
+        speculative = [t for t in (or_task, trigram_task) if t is not None]
+        for task in speculative:
+            task.cancel()
+        if speculative:
+            await asyncio.gather(*speculative, return_exceptions=True)
 
-    # OR fallback: only when AND returned zero results
-    if len(results) == 0:
-        results = await search_fts_or(session, query, limit=max_chunks)
+    return results[:max_chunks]
 
-    if len(results) < min_fts_results:
-        trigram_results = await search_trigram(session, query, limit=max_chunks)
-        seen_ids = {chunk.id for chunk in results}
-        for chunk in trigram_results:
-            if chunk.id not in seen_ids and len(results) < max_chunks:
-                results.append(chunk)
-                seen_ids.add(chunk.id)
 
-    return results[:max_chunks]
+async def retrieve_chunks_sql(
+    session: AsyncSession,
+    query: str,
+    min_fts_results: int = 3,
+    max_chunks: int = 12,
+    threshold: float = 0.15,
+) -> list[RetrievedChunk]:
+    """Single-round-trip variant of ``retrieve_chunks``.
+
+    Expresses the same cascade as one statement: an ``fts`` CTE (AND
+    semantics), an ``fts_or`` CTE that only yields rows when ``fts`` is empty,
+    and a ``tri`` CTE that only yields rows when the FTS stages found fewer
+    than *min_fts_results*.  The union is deduplicated by chunk id with
+    ``DISTINCT ON`` (FTS rows win over trigram rows) and ordered FTS-first,
+    then by score, capped at *max_chunks*.
+
+    Enabled with ``settings.retrieval_single_query``.
+    """
+    base_cols = (
+        KBChunk.id,
+        Repo.owner,
+        Repo.name,
+        KBChunk.path,
+        KBChunk.commit_sha,
+        KBChunk.start_line,
+        KBChunk.end_line,
+        KBChunk.content,
+    )
+
+    and_query = func.websearch_to_tsquery("english", query)
+    and_rank = func.ts_rank_cd(KBChunk.content_tsv, and_query)
+    fts = (
+        select(*base_cols, and_rank.label("score"), literal(0).label("pri"))
+        .join(Repo, KBChunk.repo_id == Repo.id)
+        .where(KBChunk.content_tsv.op("@@")(and_query))
+        .order_by(and_rank.desc())
+        .limit(max_chunks)
+        .cte("fts")
+    )
+    stages = [select(fts)]
+
+    or_text = _build_or_tsquery_text(query)
+    if or_text is not None:
+        or_query = func.to_tsquery("english", or_text)
+        or_rank = func.ts_rank_cd(KBChunk.content_tsv, or_query)
+        fts_or = (
+            select(*base_cols, or_rank.label("score"), literal(0).label("pri"))
+            .join(Repo, KBChunk.repo_id == Repo.id)
+            .where(KBChunk.content_tsv.op("@@")(or_query))
+            .where(~exists(select(fts.c.id)))
+            .order_by(or_rank.desc())
+            .limit(max_chunks)
+            .cte("fts_or")
+        )
+        stages.append(select(fts_or))
+
+    fts_all = union_all(*stages).cte("fts_all") if len(stages) > 1 else fts
+    fts_count = select(func.count()).select_from(fts_all).scalar_subquery()
+
+    similarity = func.similarity(KBFile.path, query)
+    tri = (
+        select(*base_cols, similarity.label("score"), literal(1).label("pri"))
+        .join(KBFile, KBChunk.file_id == KBFile.id)
+        .join(Repo, KBChunk.repo_id == Repo.id)
+        .where(similarity > threshold)
+        .where(fts_count < min_fts_results)
+        .order_by(similarity.desc())
+        .limit(max_chunks)
+        .cte("tri")
+    )
+
+    combined = union_all(select(fts_all), select(tri)).subquery("combined")
+    deduped = (
+        select(combined)
+        .distinct(combined.c.id)
+        .order_by(combined.c.id, combined.c.pri)
+        .subquery("deduped")
+    )
+    stmt = select(deduped).order_by(deduped.c.pri, deduped.c.score.desc()).limit(max_chunks)
+
+    result = await session.execute(stmt)
+    return [
+        RetrievedChunk(
+            id=row.id,
+            repo_owner=row.owner,
+            repo_name=row.name,
+            path=row.path,
+            commit_sha=row.commit_sha,
+            start_line=row.start_line,
+            end_line=row.end_line,
+            content=row.content,
+            score=row.score,
+        )
+        for row in result
+    ]
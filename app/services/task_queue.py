@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+from dataclasses import dataclass
 from typing import Protocol
 
 
@@ -56,13 +57,21 @@ class CloudTasksQueue:
         return response.name
 
 
+@dataclass(slots=True)
+class TaskRecord:
+    """A task captured by ``InMemoryTaskQueue``."""
+
+    url: str
+    payload: dict
+
+
 class InMemoryTaskQueue:
     """Test double that records enqueued tasks for assertions."""
 
     def __init__(self) -> None:
-        self.tasks: list[dict] = []
+        self.tasks: list[TaskRecord] = []
 
     async def enqueue(self, url: str, payload: dict) -> str:
         """Append task to the in-memory list and return a fake task name."""
-        self.tasks.append({"url": url, "payload": payload})
+        self.tasks.append(TaskRecord(url, payload))
         return f"fake-task-{len(self.tasks)}"
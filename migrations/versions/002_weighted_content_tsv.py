@@ -0,0 +1,62 @@
+"""Weight file-path terms above body terms in kb_chunks.content_tsv.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: str | None = "001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Path separators become spaces so "app/services/retrieval.py" yields the
+# lexemes app/servic/retriev/py rather than one opaque file token.
+_WEIGHTED_TSV = (
+    "setweight(to_tsvector('english', translate(path, '/.-', '   ')), 'A') || "
+    "setweight(to_tsvector('english', content), 'B')"
+)
+_CONTENT_TSV = "to_tsvector('english', content)"
+
+
+def _replace_content_tsv(expression: str) -> None:
+    """Recreate content_tsv (and its GIN index) with a new generated expression.
+
+    Generated-column expressions cannot be altered in place before
+    PostgreSQL 17, so the column is dropped and re-added.
+    """
+    op.drop_index("ix_kb_chunks_content_tsv", table_name="kb_chunks")
+    op.drop_column("kb_chunks", "content_tsv")
+    op.add_column(
+        "kb_chunks",
+        sa.Column(
+            "content_tsv",
+            TSVECTOR,
+            sa.Computed(expression, persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_kb_chunks_content_tsv",
+        "kb_chunks",
+        ["content_tsv"],
+        postgresql_using="gin",
+    )
+
+
+def upgrade() -> None:
+    """Index path terms at weight A and content terms at weight B."""
+    _replace_content_tsv(_WEIGHTED_TSV)
+
+
+def downgrade() -> None:
+    """Restore the content-only tsvector."""
+    _replace_content_tsv(_CONTENT_TSV)
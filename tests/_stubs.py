@@ -0,0 +1,63 @@
+"""Hand-written stand-ins for third-party clients used in tests.
+
+Plain classes with just the surface the code under test touches: cheaper
+than ``MagicMock`` chains and explicit about what is being faked.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class StubResult:
+    """Stands in for the SQLAlchemy Result returned by ``session.execute``."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value: object) -> None:
+        self._value = value
+
+    def scalar_one_or_none(self) -> object:
+        return self._value
+
+
+class StubResponse:
+    """Successful streamed response whose text arrives in fixed-size pieces."""
+
+    def __init__(self, text: str, chunk_size: int) -> None:
+        self._text = text
+        self._chunk_size = chunk_size
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def aiter_text(self) -> AsyncIterator[str]:
+        for i in range(0, len(self._text), self._chunk_size):
+            yield self._text[i : i + self._chunk_size]
+
+
+class StubAsyncClient:
+    """Minimal ``httpx.AsyncClient`` replacement serving one canned body.
+
+    Records requested URLs in ``requested`` for assertions.
+    """
+
+    def __init__(self, text: str, chunk_size: int = 16) -> None:
+        self.text = text
+        self.chunk_size = chunk_size
+        self.requested: list[str] = []
+
+    async def __aenter__(self) -> StubAsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> bool:
+        return False
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str) -> AsyncIterator[StubResponse]:
+        self.requested.append(url)
+        yield StubResponse(self.text, self.chunk_size)
@@ -1,18 +1,86 @@
 """Shared test fixtures for async DB session and FastAPI test client."""
 
-from collections.abc import AsyncGenerator
+import asyncio
+import hashlib
+import hmac
+import io
+import logging
+from collections.abc import AsyncGenerator, Generator
 from unittest.mock import AsyncMock
 
 import pytest
+import structlog
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
+from structlog.testing import capture_logs
 
 from app.db.session import get_db_session
-from app.dependencies import get_gemini_client, get_task_queue
+from app.dependencies import (
+    get_gemini_client,
+    get_retrieval_cache,
+    get_session_factory,
+    get_task_queue,
+)
 from app.main import app
 from app.services.gemini_client import InMemoryLLMClient
+from app.services.query_cache import RetrievalCache
 from app.services.task_queue import InMemoryTaskQueue
 
+# Matches the ``github_webhook_secret`` default the app runs with under test.
+WEBHOOK_SECRET = "dev-secret"
+
+
+def sign_webhook(body: bytes, secret: str = WEBHOOK_SECRET) -> str:
+    """Compute the GitHub-style HMAC-SHA256 signature header for a payload."""
+    digest = hmac.new(
+        secret.encode("utf-8"),
+        msg=body,
+        digestmod=hashlib.sha256,
+    ).hexdigest()
+    return f"sha256={digest}"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    """Run ``@pytest.mark.anyio`` tests on asyncio only.
+
+    Session-scoped so the backend is resolved once per xdist worker instead
+    of once per test module.
+    """
+    return "asyncio"
+
+
+_QUIET_WRAPPER = structlog.make_filtering_bound_logger(logging.CRITICAL)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _quiet_structlog() -> Generator[None, None, None]:
+    """Drop sub-CRITICAL structlog calls for the whole test session.
+
+    A filtering bound logger turns ``logger.info(...)`` and friends into a
+    bare ``return None``, so app code under test never runs the processor
+    chain or writes to stdout.  Loggers are not cached, so ``captured_logs``
+    can lower the level for a single test.
+    """
+    structlog.configure(
+        wrapper_class=_QUIET_WRAPPER,
+        logger_factory=structlog.PrintLoggerFactory(file=io.StringIO()),
+        cache_logger_on_first_use=False,
+    )
+    yield
+    structlog.reset_defaults()
+
+
+@pytest.fixture
+def captured_logs() -> Generator[list[dict], None, None]:
+    """Capture every structlog event emitted during a test, at any level."""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG))
+    try:
+        with capture_logs() as logs:
+            yield logs
+    finally:
+        structlog.configure(wrapper_class=_QUIET_WRAPPER)
+
 
 @pytest.fixture
 def mock_db_session() -> AsyncMock:
@@ -38,16 +106,47 @@ def mock_gemini_client() -> InMemoryLLMClient:
 
 
 @pytest.fixture
-async def client(
+def retrieval_cache() -> RetrievalCache:
+    """Create a fresh retrieval cache so cached chunks never leak between tests."""
+    return RetrievalCache()
+
+
+@pytest.fixture(scope="session")
+def _shared_client() -> Generator[AsyncClient, None, None]:
+    """Build one AsyncClient per test session (per xdist worker).
+
+    The transport holds no per-test state (dependencies are resolved through
+    ``app.dependency_overrides`` on every request), so the client and its
+    transport are reused by every test in the session.  Constructing it
+    outside an event loop lets sync and async tests share it regardless of
+    which loop each test runs on.
+
+    ``ASGITransport`` only forwards ``http`` scopes and never sends lifespan
+    events, so the app's startup/shutdown (engine init/dispose) does not run
+    here; everything the routes need comes from the overrides in ``client``.
+    """
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    ac = AsyncClient(transport=transport, base_url="http://test")
+    yield ac
+    asyncio.run(ac.aclose())
+
+
+@pytest.fixture
+def client(
+    _shared_client: AsyncClient,
     mock_db_session: AsyncMock,
     mock_task_queue: InMemoryTaskQueue,
     mock_gemini_client: InMemoryLLMClient,
-) -> AsyncGenerator[AsyncClient, None]:
-    """Yield an httpx AsyncClient with dependencies overridden.
+    retrieval_cache: RetrievalCache,
+) -> Generator[AsyncClient, None, None]:
+    """Yield the session's shared AsyncClient with dependencies overridden.
 
     Uses the mock session so tests don't require a running database,
-    an in-memory task queue for inspecting enqueued tasks, and an
-    in-memory LLM client for controlling chat responses.
+    an in-memory task queue for inspecting enqueued tasks, an
+    in-memory LLM client for controlling chat responses, a
+    per-test retrieval cache, and no extra session factory (retrieval stays
+    on the single mock session).  Overrides point at this test's fixtures and
+    are cleared afterwards, so no state carries over between tests.
     """
 
     async def _override_db_session() -> AsyncGenerator[AsyncSession, None]:
@@ -56,7 +155,7 @@ async def client(
     app.dependency_overrides[get_db_session] = _override_db_session
     app.dependency_overrides[get_task_queue] = lambda: mock_task_queue
     app.dependency_overrides[get_gemini_client] = lambda: mock_gemini_client
-    transport = ASGITransport(app=app, raise_app_exceptions=False)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    app.dependency_overrides[get_retrieval_cache] = lambda: retrieval_cache
+    app.dependency_overrides[get_session_factory] = lambda: None
+    yield _shared_client
     app.dependency_overrides.clear()
@@ -2,10 +2,11 @@
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
-import httpx
 import pytest
 
+from app.db.models import KBChunk
 from app.routers.admin import extract_text_from_html
+from tests._stubs import StubAsyncClient
 
 # ---------------------------------------------------------------------------
 # HTML text extraction
@@ -179,12 +180,10 @@ async def test_backfill_empty_repos_rejected(client):
 
 
 @pytest.mark.anyio
-async def test_ingest_url_creates_chunks(client, mock_db_session):
+async def test_ingest_url_creates_chunks(client, mock_db_session, retrieval_cache):
     """ingest-url fetches HTML, extracts text, and creates chunks."""
     html = "<html><body><h1>Project</h1><p>Description here</p></body></html>"
-
-    def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, text=html)
+    retrieval_cache.put("what is personal-brand?", [MagicMock()])
 
     mock_db_session.add = MagicMock()
 
@@ -193,16 +192,8 @@ async def test_ingest_url_creates_chunks(client, mock_db_session):
     result_mock.scalar_one_or_none.return_value = None
     mock_db_session.execute.return_value = result_mock
 
-    with patch("app.routers.admin.httpx.AsyncClient") as mock_client_cls:
-        mock_client_instance = AsyncMock()
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client_instance)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        mock_resp = MagicMock()
-        mock_resp.text = html
-        mock_resp.raise_for_status = MagicMock()
-        mock_client_instance.get.return_value = mock_resp
-
+    stub = StubAsyncClient(html)
+    with patch("app.routers.admin.httpx.AsyncClient", lambda **_: stub):
         resp = await client.post(
             "/admin/ingest-url",
             json={
@@ -216,6 +207,15 @@ async def test_ingest_url_creates_chunks(client, mock_db_session):
     data = resp.json()
     assert data["status"] == "ingested"
     assert data["chunks_created"] >= 1
+    assert stub.requested == ["https://dan-weinbeck.com/projects/personal-brand"]
+    # Chunks skip session.add and go in through one batched INSERT
+    added = [c.args[0] for c in mock_db_session.add.call_args_list]
+    assert not any(isinstance(obj, KBChunk) for obj in added)
+    rows = mock_db_session.execute.await_args.args[1]
+    assert [row["content"] for row in rows] == ["Project\nDescription here"]
+    # New content is committed and the retrieval cache dropped.
+    mock_db_session.commit.assert_awaited()
+    assert retrieval_cache.get("what is personal-brand?") is None
 
 
 @pytest.mark.anyio
@@ -228,16 +228,8 @@ async def test_ingest_url_uses_custom_path(client, mock_db_session):
     result_mock.scalar_one_or_none.return_value = None
     mock_db_session.execute.return_value = result_mock
 
-    with patch("app.routers.admin.httpx.AsyncClient") as mock_client_cls:
-        mock_client_instance = AsyncMock()
-        mock_client_cls.return_value.__aenter__ = AsyncMock(return_value=mock_client_instance)
-        mock_client_cls.return_value.__aexit__ = AsyncMock(return_value=False)
-
-        mock_resp = MagicMock()
-        mock_resp.text = html
-        mock_resp.raise_for_status = MagicMock()
-        mock_client_instance.get.return_value = mock_resp
-
+    stub = StubAsyncClient(html)
+    with patch("app.routers.admin.httpx.AsyncClient", lambda **_: stub):
         resp = await client.post(
             "/admin/ingest-url",
             json={
@@ -7,12 +7,13 @@ question validation, and LLM error handling.
 
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.routers.chat import build_context, parse_llm_response, verify_citations
+from app.schemas.chat import LLMCitation, LLMResponse
 from app.services.retrieval import RetrievedChunk
 
 if TYPE_CHECKING:
@@ -62,13 +63,17 @@ def _llm_response_json(
     needs_clarification: bool = False,
     clarifying_question: str | None = None,
 ) -> str:
-    """Build a valid LLMResponse JSON string."""
-    return json.dumps({
-        "answer": answer,
-        "citations": citations or [],
-        "needs_clarification": needs_clarification,
-        "clarifying_question": clarifying_question,
-    })
+    """Build a valid LLMResponse JSON string.
+
+    Serialized by the model itself (pydantic-core, compact output), so the
+    canned payload is validated against the real schema as it is built.
+    """
+    return LLMResponse(
+        answer=answer,
+        citations=[LLMCitation(**c) for c in citations or ()],
+        needs_clarification=needs_clarification,
+        clarifying_question=clarifying_question,
+    ).model_dump_json()
 
 
 # ---------- Test 1: Success with citations ----------
@@ -383,3 +388,127 @@ async def test_chat_llm_error_returns_graceful_response(
     assert "sorry" in data["answer"].lower() or "error" in data["answer"].lower()
     assert data["confidence"] == "low"
     assert data["citations"] == []
+
+
+# ---------- Test 11: LLM transport failure returns graceful response ----------
+
+
+@pytest.mark.anyio
+@patch("app.routers.chat.retrieve_chunks", new_callable=AsyncMock)
+async def test_chat_llm_call_failure_returns_graceful_response(
+    mock_retrieve: AsyncMock,
+    client: AsyncClient,
+    mock_gemini_client: InMemoryLLMClient,
+) -> None:
+    """An exception from the LLM client itself is also handled gracefully."""
+    mock_retrieve.return_value = [_make_chunk(id=1, score=0.5)]
+    mock_gemini_client.generate = AsyncMock(side_effect=RuntimeError("quota exceeded"))
+
+    response = await client.post("/chat", json={"question": "What is it?"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert "sorry" in data["answer"].lower()
+    assert data["confidence"] == "low"
+    assert data["citations"] == []
+
+
+def test_parse_llm_response_valid_and_invalid() -> None:
+    """parse_llm_response returns a model for valid JSON and None otherwise."""
+    parsed = parse_llm_response(_llm_response_json(answer="hi"))
+    assert parsed is not None
+    assert parsed.answer == "hi"
+    assert parse_llm_response("not valid json at all") is None
+    assert parse_llm_response('{"answer": "missing fields"}') is None
+    assert parse_llm_response(None) is None
+
+
+def test_parse_llm_response_none_is_logged_as_empty(captured_logs: list[dict]) -> None:
+    """A missing LLM response logs llm_response_empty without invented counts."""
+    assert parse_llm_response(None) is None
+
+    assert captured_logs == [{"event": "llm_response_empty", "log_level": "warning"}]
+
+
+def test_build_context_headers_match_verifiable_sources() -> None:
+    """Every chunk header in the context is a source verify_citations accepts."""
+    chunks = [_make_chunk(id=1), _make_chunk(id=2, path="src/b.py", start_line=3, end_line=9)]
+    context = build_context(chunks)
+    sources = [_citation_source(c) for c in chunks]
+    for source in sources:
+        assert f"--- CHUNK: {source} ---" in context
+    citations = [LLMCitation(source=s, relevance="r") for s in [*sources, "fake/x@y:1-2"]]
+    assert [c.source for c in verify_citations(citations, chunks)] == sources
+
+
+@pytest.mark.anyio
+@patch("app.routers.chat.retrieve_chunks", new_callable=AsyncMock)
+async def test_chat_repeated_question_served_from_retrieval_cache(
+    mock_retrieve: AsyncMock,
+    client: AsyncClient,
+) -> None:
+    """A repeated question reuses cached chunks instead of querying again."""
+    mock_retrieve.return_value = [_make_chunk(id=1, score=0.5)]
+
+    first = await client.post("/chat", json={"question": "What is it?"})
+    second = await client.post("/chat", json={"question": "  what IS it? "})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    mock_retrieve.assert_awaited_once()
+
+
+@pytest.mark.anyio
+@patch("app.routers.chat.has_any_chunks", new_callable=AsyncMock, return_value=True)
+@patch("app.routers.chat.retrieve_chunks", new_callable=AsyncMock)
+async def test_chat_empty_retrieval_is_not_cached(
+    mock_retrieve: AsyncMock,
+    mock_has_any: AsyncMock,
+    client: AsyncClient,
+) -> None:
+    """Empty results are retried so freshly indexed content is found."""
+    mock_retrieve.return_value = []
+
+    await client.post("/chat", json={"question": "What is foo?"})
+    await client.post("/chat", json={"question": "What is foo?"})
+
+    assert mock_retrieve.await_count == 2
+
+
+@pytest.mark.anyio
+@patch("app.routers.chat.retrieve_chunks", new_callable=AsyncMock)
+async def test_chat_invalid_llm_output_is_logged_as_invalid_response(
+    mock_retrieve: AsyncMock,
+    client: AsyncClient,
+    mock_gemini_client: InMemoryLLMClient,
+    captured_logs: list[dict],
+) -> None:
+    """Unparseable LLM output logs llm_response_invalid, not a generation failure."""
+    mock_retrieve.return_value = [_make_chunk(id=1, score=0.5)]
+    mock_gemini_client.response = "not valid json at all"
+
+    await client.post("/chat", json={"question": "What is it?"})
+
+    events = [entry["event"] for entry in captured_logs]
+    assert "llm_response_invalid" in events
+    assert "llm_generation_failed" not in events
+
+
+@pytest.mark.anyio
+@patch("app.routers.chat.retrieve_chunks", new_callable=AsyncMock)
+@patch("app.routers.chat.retrieve_chunks_sql", new_callable=AsyncMock)
+async def test_chat_single_query_flag_uses_cte_retrieval(
+    mock_retrieve_sql: AsyncMock,
+    mock_retrieve: AsyncMock,
+    client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """RETRIEVAL_SINGLE_QUERY routes retrieval through retrieve_chunks_sql."""
+    monkeypatch.setattr("app.routers.chat.settings.retrieval_single_query", True)
+    mock_retrieve_sql.return_value = [_make_chunk(id=1, score=0.5)]
+
+    response = await client.post("/chat", json={"question": "What is it?"})
+
+    assert response.status_code == 200
+    mock_retrieve_sql.assert_awaited_once()
+    mock_retrieve.assert_not_awaited()
@@ -234,3 +234,12 @@ class TestChunkFile:
         chunks_small = chunk_file(content, "app.py", max_lines=100)
         # With smaller max_lines, should produce more chunks
         assert len(chunks_small) >= len(chunks_default)
+
+    def test_shared_offsets_match_standalone_chunkers(self) -> None:
+        """Offsets computed once in chunk_file give the same lines as a cold call."""
+        md = "# A\nLine 2\nLine 3\n## B\nLine 5"
+        assert chunk_file(md, "doc.md") == chunk_markdown(md)
+        py = "\n".join(
+            f"def func_{i}():\n" + "\n".join(f"    x = {j}" for j in range(80)) for i in range(10)
+        )
+        assert chunk_file(py, "app.py") == chunk_code(py, ".py")
@@ -2,97 +2,87 @@
 
 import pytest
 
-from app.services.denylist import MAX_FILE_SIZE_BYTES, is_denied
-
-
-class TestDenylistDirs:
-    """Files inside denied directories should be rejected."""
-
-    @pytest.mark.parametrize(
-        "path",
-        [
-            "node_modules/react/index.js",
-            "dist/bundle.js",
-            "build/output.css",
-            ".git/config",
-            "vendor/lib/foo.go",
-            "__pycache__/mod.pyc",
-            ".tox/py312/lib/site.py",
-            ".venv/bin/activate",
-            ".mypy_cache/3.12/app.json",
-        ],
-    )
-    def test_denied_directories(self, path: str) -> None:
-        assert is_denied(path) is True
-
-    def test_deeply_nested_denied_dir(self) -> None:
-        assert is_denied("deep/nested/node_modules/pkg/file.js") is True
-
-    def test_build_nested_in_project(self) -> None:
-        assert is_denied("project/build/output.js") is True
-
-
-class TestDenylistExtensions:
-    """Files with denied extensions should be rejected."""
-
-    @pytest.mark.parametrize(
-        "path",
-        [
-            "logo.png",
-            "photo.jpg",
-            "icon.jpeg",
-            "anim.gif",
-            "icon.svg",
-            "favicon.ico",
-            "doc.pdf",
-            "font.woff",
-            "font.woff2",
-            "font.ttf",
-            "font.eot",
-            "song.mp3",
-            "video.mp4",
-            "archive.zip",
-            "archive.tar.gz",
-            "program.exe",
-            "library.dll",
-            "library.so",
-            "library.dylib",
-        ],
-    )
-    def test_denied_binary_extensions(self, path: str) -> None:
-        assert is_denied(path) is True
-
-    def test_minified_js(self) -> None:
-        assert is_denied("bundle.min.js") is True
-
-    def test_minified_css(self) -> None:
-        assert is_denied("styles.min.css") is True
-
-    def test_sourcemap_file(self) -> None:
-        assert is_denied("app.map") is True
-
-
-class TestDenylistExactFiles:
-    """Exact filename matches should be rejected."""
-
-    @pytest.mark.parametrize(
-        "path",
-        [
-            "package-lock.json",
-            "yarn.lock",
-            "pnpm-lock.yaml",
-            "Cargo.lock",
-            "poetry.lock",
-            "Pipfile.lock",
-            "go.sum",
-            "composer.lock",
-        ],
-    )
-    def test_denied_lock_files(self, path: str) -> None:
-        assert is_denied(path) is True
-
-    def test_nested_lock_file(self) -> None:
-        assert is_denied("subdir/package-lock.json") is True
+from app.services.denylist import DENYLIST_EXTENSIONS, MAX_FILE_SIZE_BYTES, is_denied
+
+# Every path that must be rejected on its path alone, grouped by the rule it
+# exercises.  One flat parametrization keeps collection to a single test
+# function; the ids still name each case.
+_DENIED_DIR_PATHS = [
+    "node_modules/react/index.js",
+    "dist/bundle.js",
+    "build/output.css",
+    ".git/config",
+    "vendor/lib/foo.go",
+    "__pycache__/mod.pyc",
+    ".tox/py312/lib/site.py",
+    ".venv/bin/activate",
+    ".mypy_cache/3.12/app.json",
+    "deep/nested/node_modules/pkg/file.js",
+    "project/build/output.js",
+]
+_DENIED_EXTENSION_PATHS = [
+    "logo.png",
+    "photo.jpg",
+    "icon.jpeg",
+    "anim.gif",
+    "icon.svg",
+    "favicon.ico",
+    "doc.pdf",
+    "font.woff",
+    "font.woff2",
+    "font.ttf",
+    "font.eot",
+    "song.mp3",
+    "video.mp4",
+    "archive.zip",
+    "archive.tar.gz",
+    "program.exe",
+    "library.dll",
+    "library.so",
+    "library.dylib",
+    "bundle.min.js",
+    "styles.min.css",
+    "app.map",
+]
+_DENIED_FILE_PATHS = [
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "Cargo.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "go.sum",
+    "composer.lock",
+    "subdir/package-lock.json",
+]
+ALL_DENIED_PATHS: list[str] = _DENIED_DIR_PATHS + _DENIED_EXTENSION_PATHS + _DENIED_FILE_PATHS
+
+
+@pytest.mark.parametrize("path", ALL_DENIED_PATHS)
+def test_denied(path: str) -> None:
+    """Paths in denied directories, with denied extensions, or denied names are rejected."""
+    assert is_denied(path) is True
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "scripts/build",  # file named like a denied dir
+        "dist.py",
+        "src/distribution/app.py",  # denied name is only a prefix
+        "my_vendor/lib.go",  # denied name is only a suffix
+        "src/.github/workflows/ci.yml",
+    ],
+)
+def test_only_whole_directory_components_match(path: str) -> None:
+    assert is_denied(path) is False
+
+
+def test_extension_patterns_are_plain_suffix_globs() -> None:
+    """is_denied matches extensions by suffix, so patterns must be "*" + literal."""
+    for pattern in DENYLIST_EXTENSIONS:
+        assert pattern.startswith("*")
+        assert not any(ch in pattern[1:] for ch in "*?[")
 
 
 class TestDenylistSize:
@@ -2,7 +2,14 @@
 
 from unittest.mock import patch
 
-from app.dependencies import get_gemini_client, get_task_queue, init_production_deps
+from app.dependencies import (
+    get_gemini_client,
+    get_retrieval_cache,
+    get_session_factory,
+    get_task_queue,
+    init_production_deps,
+)
+from app.services.query_cache import RetrievalCache
 
 
 def test_init_production_deps_swaps_globals():
@@ -26,3 +33,20 @@ def test_init_production_deps_swaps_globals():
 
         assert get_task_queue() is mock_ctq
         assert get_gemini_client() is mock_gc
+
+
+def test_get_retrieval_cache_returns_shared_instance():
+    """The retrieval cache is a process-wide singleton."""
+    cache = get_retrieval_cache()
+    assert isinstance(cache, RetrievalCache)
+    assert get_retrieval_cache() is cache
+
+
+def test_get_session_factory_follows_setting():
+    """The extra-session factory is the engine's, unless speculation is disabled."""
+    factory = object()
+    with patch("app.db.engine.async_session_factory", factory):
+        with patch("app.dependencies.settings.retrieval_speculative_trigram", True):
+            assert get_session_factory() is factory
+        with patch("app.dependencies.settings.retrieval_speculative_trigram", False):
+            assert get_session_factory() is None
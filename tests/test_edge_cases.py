@@ -8,21 +8,20 @@ concurrent requests.
 from __future__ import annotations
 
 import asyncio
-import hashlib
-import hmac
 import json
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from tests.conftest import sign_webhook
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
 
     from app.services.gemini_client import InMemoryLLMClient
     from app.services.task_queue import InMemoryTaskQueue
 
-WEBHOOK_SECRET = "dev-secret"
 WEBHOOK_ENDPOINT = "/webhooks/github"
 
 
@@ -31,16 +30,6 @@ WEBHOOK_ENDPOINT = "/webhooks/github"
 # ---------------------------------------------------------------------------
 
 
-def _sign(body: bytes, secret: str) -> str:
-    """Compute the GitHub-style HMAC-SHA256 signature for a payload."""
-    digest = hmac.new(
-        secret.encode("utf-8"),
-        msg=body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    return f"sha256={digest}"
-
-
 def _make_push_payload(
     *,
     ref: str = "refs/heads/main",
@@ -105,7 +94,7 @@ def _make_push_payload(
 def _post_webhook(client: AsyncClient, payload: dict) -> object:
     """Send a signed webhook POST and return the awaitable response."""
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
     return client.post(
         WEBHOOK_ENDPOINT,
         content=body,
@@ -190,7 +179,7 @@ async def test_webhook_malformed_json(client: AsyncClient) -> None:
     the global exception handler and returned as a JSON 500 response.
     """
     body = b"not-json"
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     response = await client.post(
         WEBHOOK_ENDPOINT,
@@ -215,7 +204,7 @@ async def test_webhook_missing_required_fields(client: AsyncClient) -> None:
     """
     partial_payload = {"ref": "refs/heads/main"}
     body = json.dumps(partial_payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     response = await client.post(
         WEBHOOK_ENDPOINT,
@@ -247,7 +236,7 @@ async def test_webhook_large_push_many_files(
     assert data["tasks_enqueued"] == 20
     assert len(mock_task_queue.tasks) == 20
 
-    enqueued_paths = {t["payload"]["path"] for t in mock_task_queue.tasks}
+    enqueued_paths = {t.payload["path"] for t in mock_task_queue.tasks}
     assert enqueued_paths == set(files)
 
 
@@ -346,9 +335,9 @@ async def test_chat_concurrent_requests(
         resp = await client.post("/chat", json={"question": question})
         return resp.status_code
 
-    results = await asyncio.gather(*[
-        _send_chat(f"Question number {i}") for i in range(5)
-    ])
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_send_chat(f"Question number {i}")) for i in range(5)]
+    results = [t.result() for t in tasks]
 
     assert all(code == 200 for code in results)
     assert len(results) == 5
@@ -1,5 +1,7 @@
 """Tests for the GitHub API client functions."""
 
+import json
+
 import httpx
 import pytest
 
@@ -9,14 +11,21 @@ from app.services.github_client import (
     list_repo_files,
 )
 
+# Response bodies are encoded once, outside the handlers, and returned as raw
+# content so httpx does no per-response text/JSON encoding.
+_JSON_HEADERS = [("content-type", "application/json")]
+_TEXT_HEADERS = [("content-type", "text/plain; charset=utf-8")]
+_NOT_FOUND = json.dumps({"message": "Not Found"}).encode()
+
 
 @pytest.mark.asyncio
 async def test_fetch_file_content_success() -> None:
     """A 200 response returns the raw file text."""
     expected = "def hello():\n    return 'world'\n"
+    body = expected.encode()
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, text=expected)
+        return httpx.Response(200, content=body, headers=_TEXT_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         result = await fetch_file_content(
@@ -31,7 +40,7 @@ async def test_fetch_file_content_not_found() -> None:
     """A 404 response returns None instead of raising."""
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(404, json={"message": "Not Found"})
+        return httpx.Response(404, content=_NOT_FOUND, headers=_JSON_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         result = await fetch_file_content(
@@ -48,7 +57,7 @@ async def test_fetch_file_content_sends_correct_headers() -> None:
 
     def handler(request: httpx.Request) -> httpx.Response:
         captured.append(request)
-        return httpx.Response(200, text="content")
+        return httpx.Response(200, content=b"content", headers=_TEXT_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         await fetch_file_content(
@@ -70,7 +79,7 @@ async def test_fetch_file_content_raises_on_server_error() -> None:
     """A 500 response raises httpx.HTTPStatusError."""
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(500, text="Internal Server Error")
+        return httpx.Response(500, content=b"Internal Server Error", headers=_TEXT_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         with pytest.raises(httpx.HTTPStatusError) as exc_info:
@@ -87,10 +96,10 @@ async def test_fetch_file_content_raises_on_server_error() -> None:
 @pytest.mark.asyncio
 async def test_get_repo_metadata_returns_json() -> None:
     """A 200 response returns the parsed JSON dict."""
-    meta = {"id": 42, "default_branch": "main", "full_name": "owner/repo"}
+    body = json.dumps({"id": 42, "default_branch": "main", "full_name": "owner/repo"}).encode()
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, json=meta)
+        return httpx.Response(200, content=body, headers=_JSON_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         result = await get_repo_metadata(client, "owner", "repo", "ghp_token")
@@ -104,7 +113,7 @@ async def test_get_repo_metadata_raises_on_404() -> None:
     """A 404 response raises httpx.HTTPStatusError."""
 
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(404, json={"message": "Not Found"})
+        return httpx.Response(404, content=_NOT_FOUND, headers=_JSON_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         with pytest.raises(httpx.HTTPStatusError):
@@ -119,19 +128,21 @@ async def test_get_repo_metadata_raises_on_404() -> None:
 @pytest.mark.asyncio
 async def test_list_repo_files_returns_blob_paths() -> None:
     """Only blob entries are returned, tree entries are filtered out."""
-    tree_data = {
-        "sha": "abc123",
-        "tree": [
-            {"path": "src", "type": "tree"},
-            {"path": "src/main.py", "type": "blob"},
-            {"path": "README.md", "type": "blob"},
-            {"path": "tests", "type": "tree"},
-        ],
-    }
+    body = json.dumps(
+        {
+            "sha": "abc123",
+            "tree": [
+                {"path": "src", "type": "tree"},
+                {"path": "src/main.py", "type": "blob"},
+                {"path": "README.md", "type": "blob"},
+                {"path": "tests", "type": "tree"},
+            ],
+        }
+    ).encode()
 
     def handler(request: httpx.Request) -> httpx.Response:
         assert "recursive=1" in str(request.url)
-        return httpx.Response(200, json=tree_data)
+        return httpx.Response(200, content=body, headers=_JSON_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         result = await list_repo_files(client, "owner", "repo", "main", "ghp_token")
@@ -143,8 +154,10 @@ async def test_list_repo_files_returns_blob_paths() -> None:
 async def test_list_repo_files_empty_tree() -> None:
     """An empty tree returns an empty list."""
 
+    body = json.dumps({"sha": "abc", "tree": []}).encode()
+
     def handler(request: httpx.Request) -> httpx.Response:
-        return httpx.Response(200, json={"sha": "abc", "tree": []})
+        return httpx.Response(200, content=body, headers=_JSON_HEADERS)
 
     async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
         result = await list_repo_files(client, "owner", "repo", "main", "ghp_token")
@@ -2,34 +2,36 @@
 
 from __future__ import annotations
 
-import hashlib
-import hmac
+import importlib
 import inspect
 import json
+import re
+from functools import cache
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 
 import pytest
 
+from tests.conftest import sign_webhook
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
 
     from app.services.task_queue import InMemoryTaskQueue
 
 # ---------------------------------------------------------------------------
-# Helpers (duplicated minimally from test_webhooks to keep tests standalone)
+# Helpers
 # ---------------------------------------------------------------------------
 
-WEBHOOK_SECRET = "dev-secret"
+
+@cache
+def _module_source(module_path: str) -> str:
+    """Return a module's source text, read and tokenized once per session."""
+    return inspect.getsource(importlib.import_module(module_path))
 
 
-def _sign(body: bytes, secret: str) -> str:
-    """Compute the GitHub-style HMAC-SHA256 signature for a payload."""
-    digest = hmac.new(
-        secret.encode("utf-8"),
-        msg=body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    return f"sha256={digest}"
+_STDLIB_GET_LOGGER = re.compile(r"\blogging\.getLogger\b")
+_STRUCTLOG = re.compile(r"\bstructlog\b")
 
 
 # ---------------------------------------------------------------------------
@@ -40,13 +42,9 @@ def _sign(body: bytes, secret: str) -> str:
 @pytest.mark.anyio
 async def test_global_exception_handler_returns_json() -> None:
     """The unhandled_exception_handler returns JSON with status 500."""
-    from unittest.mock import MagicMock
-
     from app.main import unhandled_exception_handler
 
-    mock_request = MagicMock()
-    mock_request.url.path = "/test"
-    mock_request.method = "GET"
+    mock_request = SimpleNamespace(url=SimpleNamespace(path="/test"), method="GET")
 
     response = await unhandled_exception_handler(mock_request, Exception("boom"))
 
@@ -83,7 +81,7 @@ async def test_webhook_branch_deletion_early_return(
         "forced": False,
     }
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     response = await client.post(
         "/webhooks/github",
@@ -121,9 +119,7 @@ def test_structlog_is_configured() -> None:
 
 def test_httpx_client_has_explicit_timeout() -> None:
     """The task handler creates httpx.AsyncClient with an explicit timeout parameter."""
-    from app.routers import tasks as tasks_module
-
-    source = inspect.getsource(tasks_module)
+    source = _module_source("app.routers.tasks")
     assert "timeout=" in source, "httpx.AsyncClient must have explicit timeout"
 
 
@@ -143,9 +139,6 @@ def test_httpx_client_has_explicit_timeout() -> None:
 )
 def test_no_stdlib_logging(module_path: str) -> None:
     """Migrated modules must use structlog, not stdlib logging.getLogger."""
-    import importlib
-
-    module = importlib.import_module(module_path)
-    source = inspect.getsource(module)
-    assert "logging.getLogger" not in source, f"{module_path} still uses stdlib logging"
-    assert "structlog" in source, f"{module_path} should use structlog"
+    source = _module_source(module_path)
+    assert not _STDLIB_GET_LOGGER.search(source), f"{module_path} still uses stdlib logging"
+    assert _STRUCTLOG.search(source), f"{module_path} should use structlog"
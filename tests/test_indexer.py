@@ -5,42 +5,47 @@ denylist, GitHub client, chunker, and the database session.
 """
 
 import hashlib
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.services.indexer import delete_file, index_file
+from app.services.indexer import bulk_insert_chunks, delete_file, index_file
+from tests._stubs import StubResult
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Content hashes for the fixed file bodies used below, computed once.
+_HELLO_SHA = hashlib.sha256(b"print('hello')").hexdigest()
+_UPDATED_SHA = hashlib.sha256(b"updated content").hexdigest()
 
-def _mock_session(existing_file=None):
-    """Build a mock AsyncSession.
 
-    If existing_file is provided, session.execute().scalar_one_or_none()
-    returns that object. Otherwise returns None (no existing file).
-    Sync methods like ``add`` use MagicMock to avoid coroutine warnings.
+class _FakeSession:
+    """Minimal AsyncSession stand-in.
+
+    ``execute`` always yields a result wrapping ``existing_file``.  Only the
+    methods tests assert on are mocks; sync ``add`` is a MagicMock so no
+    coroutine is left un-awaited.
     """
-    session = AsyncMock()
-    result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = existing_file
-    session.execute.return_value = result_mock
-    # session.add is synchronous in SQLAlchemy, so use a plain MagicMock
-    session.add = MagicMock()
-    return session
+
+    def __init__(self, existing_file=None):
+        self.execute = AsyncMock(return_value=StubResult(existing_file))
+        self.add = MagicMock()
+        self.flush = AsyncMock()
+        self.delete = AsyncMock()
 
 
 def _make_kb_file(*, file_id=1, repo_id=1, path="src/main.py", commit_sha="aaa", sha256="abc123"):
-    """Create a fake KBFile-like object for testing."""
-    obj = MagicMock()
-    obj.id = file_id
-    obj.repo_id = repo_id
-    obj.path = path
-    obj.commit_sha = commit_sha
-    obj.sha256 = sha256
-    return obj
+    """Create a fake KBFile-like object for testing.
+
+    A plain namespace rather than a MagicMock: the indexer only reads and
+    assigns these attributes, and a typo'd attribute fails loudly.
+    """
+    return SimpleNamespace(
+        id=file_id, repo_id=repo_id, path=path, commit_sha=commit_sha, sha256=sha256
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -48,122 +53,122 @@ def _make_kb_file(*, file_id=1, repo_id=1, path="src/main.py", commit_sha="aaa",
 # ---------------------------------------------------------------------------
 
 
+def _patch_deps(monkeypatch, *, denied=False, fetch=None, chunks=()):
+    """Replace the indexer's collaborators with mocks and return them by name."""
+    mocks = {
+        "get_or_create_repo": AsyncMock(),
+        "is_denied": MagicMock(return_value=denied),
+        "fetch_file_content": AsyncMock(return_value=fetch),
+        "chunk_file": MagicMock(return_value=list(chunks)),
+    }
+    for name, mock in mocks.items():
+        monkeypatch.setattr(f"app.services.indexer.{name}", mock)
+    return mocks
+
+
+def _inserted(session):
+    """(start_line, end_line, content) of the rows bulk-inserted last on *session*."""
+    rows = session.execute.await_args.args[1]
+    return [(r["start_line"], r["end_line"], r["content"]) for r in rows]
+
+
 @pytest.mark.anyio
-@patch("app.services.indexer.get_or_create_repo", new_callable=AsyncMock)
-@patch("app.services.indexer.fetch_file_content", new_callable=AsyncMock)
-@patch("app.services.indexer.is_denied", return_value=True)
-async def test_index_file_denylist_skip(mock_denied, mock_fetch, mock_repo):
+async def test_index_file_denylist_skip(monkeypatch):
     """Path matching denylist returns skipped status without GitHub API call."""
-    session = _mock_session()
-    client = AsyncMock()
+    mocks = _patch_deps(monkeypatch, denied=True)
+    session = _FakeSession()
 
     result = await index_file(
-        session,
-        client,
-        "owner",
-        "repo",
-        1,
-        "node_modules/foo.js",
-        "sha1",
-        "tok",
+        session, AsyncMock(), "owner", "repo", 1, "node_modules/foo.js", "sha1", "tok"
     )
 
     assert result == {"status": "skipped", "reason": "denylist"}
-    mock_fetch.assert_not_called()
+    mocks["fetch_file_content"].assert_not_called()
     session.add.assert_not_called()
 
 
 @pytest.mark.anyio
-@patch("app.services.indexer.get_or_create_repo", new_callable=AsyncMock)
-@patch("app.services.indexer.chunk_file")
-@patch("app.services.indexer.fetch_file_content", new_callable=AsyncMock, return_value=None)
-@patch("app.services.indexer.is_denied", return_value=False)
-async def test_index_file_not_found(mock_denied, mock_fetch, mock_chunk, mock_repo):
+async def test_index_file_not_found(monkeypatch):
     """GitHub returning None (404) results in skipped/not_found status."""
-    session = _mock_session()
-    client = AsyncMock()
+    mocks = _patch_deps(monkeypatch, fetch=None)
+    session = _FakeSession()
 
-    result = await index_file(session, client, "owner", "repo", 1, "gone.py", "sha1", "tok")
+    result = await index_file(session, AsyncMock(), "owner", "repo", 1, "gone.py", "sha1", "tok")
 
     assert result == {"status": "skipped", "reason": "not_found"}
-    mock_chunk.assert_not_called()
+    mocks["chunk_file"].assert_not_called()
 
 
 @pytest.mark.anyio
-@patch("app.services.indexer.get_or_create_repo", new_callable=AsyncMock)
-@patch("app.services.indexer.chunk_file", return_value=[(1, 10, "chunk content")])
-@patch(
-    "app.services.indexer.fetch_file_content",
-    new_callable=AsyncMock,
-    return_value="print('hello')",
-)
-@patch("app.services.indexer.is_denied", return_value=False)
-async def test_index_file_new_file(mock_denied, mock_fetch, mock_chunk, mock_repo):
+async def test_index_file_new_file(monkeypatch):
     """Happy path: new file is fetched, chunked, and KBFile + KBChunks created."""
-    session = _mock_session(existing_file=None)
-    client = AsyncMock()
+    _patch_deps(monkeypatch, fetch="print('hello')", chunks=[(1, 10, "chunk content")])
+    session = _FakeSession()
 
-    result = await index_file(session, client, "owner", "repo", 1, "src/main.py", "sha1", "tok")
+    result = await index_file(
+        session, AsyncMock(), "owner", "repo", 1, "src/main.py", "sha1", "tok"
+    )
 
-    assert result["status"] == "indexed"
-    assert result["chunks"] == 1
-    # KBFile added via session.add (at least 2 calls: 1 for file, 1 for chunk)
-    assert session.add.call_count >= 2
+    assert result == {"status": "indexed", "chunks": 1}
+    # Only the KBFile goes through session.add; it is flushed for its id
+    session.add.assert_called_once()
     session.flush.assert_awaited_once()
+    # Chunks go in through one executemany INSERT
+    assert _inserted(session) == [(1, 10, "chunk content")]
 
 
 @pytest.mark.anyio
-@patch("app.services.indexer.get_or_create_repo", new_callable=AsyncMock)
-@patch("app.services.indexer.chunk_file")
-@patch("app.services.indexer.fetch_file_content", new_callable=AsyncMock)
-@patch("app.services.indexer.is_denied", return_value=False)
-async def test_index_file_unchanged(mock_denied, mock_fetch, mock_chunk, mock_repo):
+async def test_index_file_unchanged(monkeypatch):
     """Existing file with same sha256 returns unchanged and skips chunking."""
-    content = "print('hello')"
-    mock_fetch.return_value = content
-
-    content_hash = hashlib.sha256(content.encode()).hexdigest()
-    existing = _make_kb_file(sha256=content_hash)
+    mocks = _patch_deps(monkeypatch, fetch="print('hello')")
+    existing = _make_kb_file(sha256=_HELLO_SHA)
+    session = _FakeSession(existing)
 
-    session = _mock_session(existing_file=existing)
-    client = AsyncMock()
-
-    result = await index_file(session, client, "owner", "repo", 1, "src/main.py", "newsha", "tok")
+    result = await index_file(
+        session, AsyncMock(), "owner", "repo", 1, "src/main.py", "newsha", "tok"
+    )
 
     assert result == {"status": "unchanged"}
     # commit_sha should be updated
     assert existing.commit_sha == "newsha"
     # No chunking should happen
-    mock_chunk.assert_not_called()
+    mocks["chunk_file"].assert_not_called()
 
 
 @pytest.mark.anyio
-@patch("app.services.indexer.get_or_create_repo", new_callable=AsyncMock)
-@patch("app.services.indexer.chunk_file", return_value=[(1, 5, "new chunk")])
-@patch(
-    "app.services.indexer.fetch_file_content",
-    new_callable=AsyncMock,
-    return_value="updated content",
-)
-@patch("app.services.indexer.is_denied", return_value=False)
-async def test_index_file_updated(mock_denied, mock_fetch, mock_chunk, mock_repo):
+async def test_index_file_updated(monkeypatch):
     """Existing file with different sha256: old chunks deleted, new chunks created."""
+    _patch_deps(monkeypatch, fetch="updated content", chunks=[(1, 5, "new chunk")])
     existing = _make_kb_file(sha256="old_hash")
-    session = _mock_session(existing_file=existing)
-    client = AsyncMock()
+    session = _FakeSession(existing)
 
-    result = await index_file(session, client, "owner", "repo", 1, "src/main.py", "newsha", "tok")
+    result = await index_file(
+        session, AsyncMock(), "owner", "repo", 1, "src/main.py", "newsha", "tok"
+    )
 
-    assert result["status"] == "indexed"
-    assert result["chunks"] == 1
-    # session.execute should have been called for select AND delete
-    assert session.execute.call_count >= 2
+    assert result == {"status": "indexed", "chunks": 1}
+    # session.execute should have been called for select, delete AND insert
+    assert session.execute.call_count >= 3
+    assert _inserted(session) == [(1, 5, "new chunk")]
     # sha256 and commit_sha should be updated on the existing file
-    expected_hash = hashlib.sha256(b"updated content").hexdigest()
-    assert existing.sha256 == expected_hash
+    assert existing.sha256 == _UPDATED_SHA
     assert existing.commit_sha == "newsha"
 
 
+@pytest.mark.anyio
+async def test_bulk_insert_chunks_single_execute():
+    """All rows are passed to one execute call; no rows means no query."""
+    session = _FakeSession()
+    rows = [{"start_line": i, "end_line": i + 1, "content": "x"} for i in range(3)]
+
+    await bulk_insert_chunks(session, rows)
+    await bulk_insert_chunks(session, [])
+
+    session.execute.assert_awaited_once()
+    assert session.execute.await_args.args[1] is rows
+    session.add.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # delete_file tests
 # ---------------------------------------------------------------------------
@@ -173,7 +178,7 @@ async def test_index_file_updated(mock_denied, mock_fetch, mock_chunk, mock_repo
 async def test_delete_file_exists():
     """Existing file and its chunks are deleted, returns deleted status."""
     existing = _make_kb_file()
-    session = _mock_session(existing_file=existing)
+    session = _FakeSession(existing)
 
     result = await delete_file(session, 1, "src/main.py")
 
@@ -186,7 +191,7 @@ async def test_delete_file_exists():
 @pytest.mark.anyio
 async def test_delete_file_not_found():
     """Non-existent file returns not_found status."""
-    session = _mock_session(existing_file=None)
+    session = _FakeSession()
 
     result = await delete_file(session, 1, "nonexistent.py")
 
@@ -6,15 +6,15 @@ from conftest.py (mock_db_session, mock_task_queue, mock_gemini_client, client).
 
 from __future__ import annotations
 
-import hashlib
-import hmac
 import json
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from app.schemas.chat import LLMCitation, LLMResponse
 from app.services.retrieval import RetrievedChunk
+from tests.conftest import sign_webhook
 
 if TYPE_CHECKING:
     from httpx import AsyncClient
@@ -22,7 +22,6 @@ if TYPE_CHECKING:
     from app.services.gemini_client import InMemoryLLMClient
     from app.services.task_queue import InMemoryTaskQueue
 
-WEBHOOK_SECRET = "dev-secret"
 WEBHOOK_ENDPOINT = "/webhooks/github"
 
 _DEFAULT_SHA = "abc1234567890123456789012345678901234567"
@@ -33,16 +32,6 @@ _DEFAULT_SHA = "abc1234567890123456789012345678901234567"
 # ---------------------------------------------------------------------------
 
 
-def _sign(body: bytes, secret: str) -> str:
-    """Compute the GitHub-style HMAC-SHA256 signature for a payload."""
-    digest = hmac.new(
-        secret.encode("utf-8"),
-        msg=body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    return f"sha256={digest}"
-
-
 def _make_push_payload(
     *,
     num_commits: int = 1,
@@ -134,13 +123,13 @@ def _llm_response_json(
     needs_clarification: bool = False,
     clarifying_question: str | None = None,
 ) -> str:
-    """Build a valid LLMResponse JSON string."""
-    return json.dumps({
-        "answer": answer,
-        "citations": citations or [],
-        "needs_clarification": needs_clarification,
-        "clarifying_question": clarifying_question,
-    })
+    """Build a valid LLMResponse JSON string, serialized by the model itself."""
+    return LLMResponse(
+        answer=answer,
+        citations=[LLMCitation(**c) for c in citations or ()],
+        needs_clarification=needs_clarification,
+        clarifying_question=clarifying_question,
+    ).model_dump_json()
 
 
 # ---------------------------------------------------------------------------
@@ -158,7 +147,7 @@ async def test_full_pipeline_webhook_to_chat(
     # ---- Step 1: POST webhook with 1 added file ----
     payload = _make_push_payload(added=["src/main.py"])
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     wh_resp = await client.post(
         WEBHOOK_ENDPOINT,
@@ -175,13 +164,13 @@ async def test_full_pipeline_webhook_to_chat(
     assert len(mock_task_queue.tasks) == 1
 
     task = mock_task_queue.tasks[0]
-    assert "/tasks/index-file" in task["url"]
-    assert task["payload"]["repo_id"] == 12345
-    assert task["payload"]["path"] == "src/main.py"
-    assert task["payload"]["commit_sha"] == "abc0000"
+    assert "/tasks/index-file" in task.url
+    assert task.payload["repo_id"] == 12345
+    assert task.payload["path"] == "src/main.py"
+    assert task.payload["commit_sha"] == "abc0000"
 
     # ---- Step 2: POST the enqueued task to /tasks/index-file ----
-    task_payload = task["payload"]
+    task_payload = task.payload
     with patch(
         "app.routers.tasks.index_file",
         new_callable=AsyncMock,
@@ -235,7 +224,7 @@ async def test_pipeline_webhook_with_multiple_files(
         modified=["src/c.py"],
     )
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     response = await client.post(
         WEBHOOK_ENDPOINT,
@@ -252,9 +241,9 @@ async def test_pipeline_webhook_with_multiple_files(
 
     # All tasks should share the same commit_sha (payload.after)
     for task in mock_task_queue.tasks:
-        assert task["payload"]["commit_sha"] == "abc0000"
+        assert task.payload["commit_sha"] == "abc0000"
 
-    enqueued_paths = {t["payload"]["path"] for t in mock_task_queue.tasks}
+    enqueued_paths = {t.payload["path"] for t in mock_task_queue.tasks}
     assert enqueued_paths == {"src/a.py", "src/b.py", "src/c.py"}
 
 
@@ -267,7 +256,7 @@ async def test_pipeline_delete_file_flow(
     # ---- Step 1: POST webhook with 1 removed file ----
     payload = _make_push_payload(removed=["old_module.py"])
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    signature = sign_webhook(body)
 
     wh_resp = await client.post(
         WEBHOOK_ENDPOINT,
@@ -282,8 +271,8 @@ async def test_pipeline_delete_file_flow(
     assert len(mock_task_queue.tasks) == 1
 
     task = mock_task_queue.tasks[0]
-    assert "/tasks/delete-file" in task["url"]
-    assert task["payload"]["path"] == "old_module.py"
+    assert "/tasks/delete-file" in task.url
+    assert task.payload["path"] == "old_module.py"
 
     # ---- Step 2: POST the delete task to /tasks/delete-file ----
     with patch(
@@ -291,7 +280,7 @@ async def test_pipeline_delete_file_flow(
         new_callable=AsyncMock,
         return_value={"status": "deleted"},
     ):
-        del_resp = await client.post("/tasks/delete-file", json=task["payload"])
+        del_resp = await client.post("/tasks/delete-file", json=task.payload)
 
     assert del_resp.status_code == 200
     assert del_resp.json()["status"] == "deleted"
@@ -68,6 +68,12 @@ class TestKBChunkColumns:
         expr_text = str(col.computed.sqltext)
         assert "to_tsvector('english', content)" in expr_text
 
+    def test_content_tsv_weights_path_above_content(self) -> None:
+        col = KBChunk.__table__.c.content_tsv
+        expr_text = str(col.computed.sqltext)
+        assert "setweight(to_tsvector('english', translate(path, '/.-', '   ')), 'A')" in expr_text
+        assert "setweight(to_tsvector('english', content), 'B')" in expr_text
+
 
 class TestIndexes:
     """Verify expected GIN indexes exist on models."""
@@ -0,0 +1,203 @@
+"""Tests for the retrieval result cache."""
+
+import asyncio
+
+import pytest
+
+from app.services.query_cache import RetrievalCache, normalize_question
+from app.services.retrieval import RetrievedChunk
+
+
+class _Clock:
+    """Manually advanced stand-in for time.monotonic."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _chunks(n: int = 1) -> list[RetrievedChunk]:
+    return [
+        RetrievedChunk(
+            id=i,
+            repo_owner="owner",
+            repo_name="repo",
+            path=f"src/f{i}.py",
+            commit_sha="a" * 40,
+            start_line=1,
+            end_line=10,
+            content="x",
+            score=0.5,
+        )
+        for i in range(n)
+    ]
+
+
+def test_normalize_question_folds_case_and_whitespace() -> None:
+    """Normalization lowercases and collapses runs of whitespace."""
+    assert normalize_question("  What  is\tTHIS?\n") == "what is this?"
+
+
+def test_get_returns_cached_chunks_for_equivalent_question() -> None:
+    """Questions that normalize identically share one cache entry."""
+    cache = RetrievalCache()
+    chunks = _chunks(2)
+    cache.put("How does auth work?", chunks)
+
+    assert cache.get("how does  auth work?") is chunks
+    assert cache.get("how does billing work?") is None
+
+
+def test_entries_expire_after_ttl() -> None:
+    """Entries stop being returned once their TTL has elapsed."""
+    clock = _Clock()
+    cache = RetrievalCache(ttl_seconds=10.0, clock=clock)
+    cache.put("q", _chunks())
+
+    clock.now = 9.9
+    assert cache.get("q") is not None
+    clock.now = 10.0
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    """A full cache evicts the entry read least recently."""
+    cache = RetrievalCache(max_entries=2)
+    cache.put("a", _chunks())
+    cache.put("b", _chunks())
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", _chunks())
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_zero_size_disables_caching() -> None:
+    """A cache sized to zero entries never stores anything."""
+    cache = RetrievalCache(max_entries=0)
+    cache.put("q", _chunks())
+    assert cache.get("q") is None
+
+
+@pytest.mark.anyio
+async def test_get_or_load_shares_one_inflight_load() -> None:
+    """Concurrent misses for the same question run the loader exactly once."""
+    cache = RetrievalCache()
+    chunks = _chunks(2)
+    release = asyncio.Event()
+    calls = 0
+
+    async def load() -> list[RetrievedChunk]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return chunks
+
+    waiters = [
+        asyncio.create_task(cache.get_or_load(q, load))
+        for q in ("How does auth work?", "how does auth work?", "HOW does auth  work?")
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert all(r is chunks for r in results)
+    assert cache.get("how does auth work?") is chunks
+
+
+@pytest.mark.anyio
+async def test_get_or_load_shares_empty_result_without_caching() -> None:
+    """Waiters share an empty result, but it is not cached."""
+    cache = RetrievalCache()
+
+    async def load() -> list[RetrievedChunk]:
+        await asyncio.sleep(0)
+        return []
+
+    results = await asyncio.gather(cache.get_or_load("q", load), cache.get_or_load("q", load))
+
+    assert results == [[], []]
+    assert len(cache) == 0
+
+
+@pytest.mark.anyio
+async def test_get_or_load_propagates_errors_to_waiters() -> None:
+    """A failing load raises for every waiter and is not remembered."""
+    cache = RetrievalCache()
+    calls = 0
+
+    async def load() -> list[RetrievedChunk]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        cache.get_or_load("q", load), cache.get_or_load("q", load), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    # The failed load is not remembered; the next call tries again.
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("q", load)
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_get_or_load_waiter_retries_when_loader_cancelled() -> None:
+    """A waiter runs its own load when the leading load is cancelled."""
+    cache = RetrievalCache()
+    chunks = _chunks()
+    started = asyncio.Event()
+
+    async def slow_load() -> list[RetrievedChunk]:
+        started.set()
+        await asyncio.sleep(10)
+        return []
+
+    async def fast_load() -> list[RetrievedChunk]:
+        return chunks
+
+    leader = asyncio.create_task(cache.get_or_load("q", slow_load))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load("q", fast_load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter is chunks
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.anyio
+async def test_clear_discards_loads_started_before_it() -> None:
+    """A load in flight when the cache is cleared answers its caller but is not stored."""
+    cache = RetrievalCache()
+    stale = _chunks(1)
+    release = asyncio.Event()
+
+    async def slow_load() -> list[RetrievedChunk]:
+        await release.wait()
+        return stale
+
+    pending = asyncio.create_task(cache.get_or_load("q", slow_load))
+    await asyncio.sleep(0)
+    cache.clear()
+    release.set()
+
+    assert await pending is stale
+    assert cache.get("q") is None
+
+    fresh = _chunks(2)
+
+    async def load() -> list[RetrievedChunk]:
+        return fresh
+
+    assert await cache.get_or_load("q", load) is fresh
+    assert cache.get("q") is fresh
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from app.services.repo_manager import get_or_create_repo
+from tests._stubs import StubResult
 
 
 @pytest.mark.anyio
@@ -13,11 +14,8 @@ async def test_get_or_create_repo_existing():
     existing_repo = MagicMock()
     existing_repo.id = 123
 
-    result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = existing_repo
-
     session = AsyncMock()
-    session.execute.return_value = result_mock
+    session.execute.return_value = StubResult(existing_repo)
     session.add = MagicMock()
 
     repo = await get_or_create_repo(session, 123, "owner", "repo")
@@ -30,11 +28,8 @@ async def test_get_or_create_repo_existing():
 @pytest.mark.anyio
 async def test_get_or_create_repo_creates_new():
     """Creates and flushes a new Repo when none exists."""
-    result_mock = MagicMock()
-    result_mock.scalar_one_or_none.return_value = None
-
     session = AsyncMock()
-    session.execute.return_value = result_mock
+    session.execute.return_value = StubResult(None)
     session.add = MagicMock()
 
     repo = await get_or_create_repo(session, 456, "dweinbeck", "my-repo")
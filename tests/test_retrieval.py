@@ -2,21 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
+import gc
+from contextlib import asynccontextmanager
+from typing import NamedTuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from app.services.retrieval import (
     RetrievedChunk,
     _build_or_tsquery_text,
     has_any_chunks,
+    reset_has_any_chunks_cache,
     retrieve_chunks,
+    retrieve_chunks_sql,
     search_fts,
     search_fts_or,
     search_trigram,
 )
 
 
+class _Row(NamedTuple):
+    """Stands in for a SQLAlchemy ``Row``: a tuple with named attribute access."""
+
+    id: int
+    owner: str
+    name: str
+    path: str
+    commit_sha: str
+    start_line: int
+    end_line: int
+    content: str
+    rank: float
+    similarity: float
+    score: float
+
+
 def _make_row(
     chunk_id: int,
     owner: str,
@@ -27,20 +50,9 @@ def _make_row(
     end: int,
     content: str,
     score: float,
-) -> MagicMock:
-    """Build a mock row that mimics a SQLAlchemy result row with attribute access."""
-    row = MagicMock()
-    row.id = chunk_id
-    row.owner = owner
-    row.name = name
-    row.path = path
-    row.commit_sha = sha
-    row.start_line = start
-    row.end_line = end
-    row.content = content
-    row.rank = score
-    row.similarity = score
-    return row
+) -> _Row:
+    """Build a row exposing the score under every label the queries use."""
+    return _Row(chunk_id, owner, name, path, sha, start, end, content, score, score, score)
 
 
 def _make_chunk(
@@ -97,6 +109,13 @@ async def test_search_fts_returns_ranked_results(mock_db_session: AsyncMock) ->
     assert chunk.content == "def foo():"
 
 
+def test_retrieved_chunk_is_immutable() -> None:
+    """Chunks are frozen so cached results can be shared safely."""
+    chunk = _make_chunk(1)
+    with pytest.raises(AttributeError):
+        chunk.score = 0.0  # type: ignore[misc]
+
+
 @pytest.mark.anyio
 async def test_search_fts_empty_results(mock_db_session: AsyncMock) -> None:
     """FTS returns an empty list when no documents match."""
@@ -153,6 +172,14 @@ def test_build_or_tsquery_text_empty() -> None:
     assert _build_or_tsquery_text("!@#$%") is None
 
 
+def test_build_or_tsquery_text_is_memoized() -> None:
+    """Repeated queries are served from the cache."""
+    _build_or_tsquery_text.cache_clear()
+    first = _build_or_tsquery_text("cached query text")
+    assert _build_or_tsquery_text("cached query text") is first
+    assert _build_or_tsquery_text.cache_info().hits == 1
+
+
 # ---------------------------------------------------------------------------
 # search_fts_or tests
 # ---------------------------------------------------------------------------
@@ -200,6 +227,14 @@ async def test_search_fts_or_no_valid_terms() -> None:
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def _fresh_has_any_chunks_cache():
+    """Each test starts without a remembered has_any_chunks result."""
+    reset_has_any_chunks_cache()
+    yield
+    reset_has_any_chunks_cache()
+
+
 @pytest.mark.anyio
 async def test_has_any_chunks_true(mock_db_session: AsyncMock) -> None:
     """Returns True when kb_chunks has at least one row."""
@@ -220,6 +255,41 @@ async def test_has_any_chunks_false(mock_db_session: AsyncMock) -> None:
     assert await has_any_chunks(mock_db_session) is False
 
 
+@pytest.mark.anyio
+async def test_has_any_chunks_caches_true(mock_db_session: AsyncMock) -> None:
+    """A True result is remembered; later calls skip the query."""
+    mock_result = MagicMock()
+    mock_result.first.return_value = MagicMock()
+    mock_db_session.execute.return_value = mock_result
+
+    assert await has_any_chunks(mock_db_session) is True
+    assert await has_any_chunks(mock_db_session) is True
+
+    mock_db_session.execute.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_has_any_chunks_false_expires(
+    mock_db_session: AsyncMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A False result is reused briefly, then the table is probed again."""
+    now = 100.0
+    monkeypatch.setattr(f"{_MODULE}._clock", lambda: now)
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_db_session.execute.return_value = mock_result
+
+    assert await has_any_chunks(mock_db_session) is False
+    now += 1.0
+    assert await has_any_chunks(mock_db_session) is False
+    assert mock_db_session.execute.await_count == 1
+
+    mock_result.first.return_value = MagicMock()  # first chunk indexed
+    now += 1.5
+    assert await has_any_chunks(mock_db_session) is True
+    assert mock_db_session.execute.await_count == 2
+
+
 # ---------------------------------------------------------------------------
 # Higher-level tests (retrieve_chunks -- patch search_fts / search_trigram)
 # ---------------------------------------------------------------------------
@@ -379,3 +449,224 @@ async def test_retrieve_chunks_respects_max_chunks() -> None:
         )
 
     assert len(results) == 12
+
+
+# ---------------------------------------------------------------------------
+# Speculative trigram (retrieve_chunks with a session_factory)
+# ---------------------------------------------------------------------------
+
+
+def _session_factory() -> MagicMock:
+    """Build a session factory whose sessions are distinct AsyncMocks."""
+
+    @asynccontextmanager
+    async def _open():
+        yield AsyncMock()
+
+    return MagicMock(side_effect=_open)
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_speculative_trigram_runs_concurrently() -> None:
+    """With a factory, trigram starts before FTS finishes, on its own session."""
+    fts_started = asyncio.Event()
+    trigram_started = asyncio.Event()
+    session = AsyncMock()
+
+    async def fake_fts(s, query, limit):
+        fts_started.set()
+        # Only completes if trigram was already started alongside it.
+        await asyncio.wait_for(trigram_started.wait(), timeout=1)
+        return [_make_chunk(1, score=0.9)]
+
+    async def fake_tri(s, query, limit):
+        trigram_started.set()
+        assert s is not session
+        return [_make_chunk(10, score=0.7), _make_chunk(1, score=0.6)]
+
+    factory = _session_factory()
+    with (
+        patch(f"{_MODULE}.search_fts", side_effect=fake_fts),
+        patch(f"{_MODULE}.search_fts_or", new_callable=AsyncMock) as mock_fts_or,
+        patch(f"{_MODULE}.search_trigram", side_effect=fake_tri),
+    ):
+        results = await retrieve_chunks(
+            session, "query", min_fts_results=3, session_factory=factory
+        )
+
+    assert [r.id for r in results] == [1, 10]
+    assert fts_started.is_set()
+    factory.assert_called_once_with()
+    mock_fts_or.assert_not_awaited()
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_speculative_trigram_cancelled_when_fts_sufficient() -> None:
+    """A speculative trigram query is cancelled once FTS alone is enough."""
+    cancelled = asyncio.Event()
+
+    async def slow_tri(s, query, limit):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return []
+
+    fts_chunks = [_make_chunk(i) for i in range(3)]
+
+    async def fake_fts(s, query, limit):
+        await asyncio.sleep(0)  # let the trigram task start
+        return fts_chunks
+
+    with (
+        patch(f"{_MODULE}.search_fts", side_effect=fake_fts),
+        patch(f"{_MODULE}.search_fts_or", new_callable=AsyncMock),
+        patch(f"{_MODULE}.search_trigram", side_effect=slow_tri),
+    ):
+        results = await asyncio.wait_for(
+            retrieve_chunks(
+                AsyncMock(), "query", min_fts_results=3, session_factory=_session_factory()
+            ),
+            timeout=1,
+        )
+
+    assert results == fts_chunks
+    assert cancelled.is_set()
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_failed_speculative_query_is_retrieved() -> None:
+    """A speculative query that fails but is never needed is not left unretrieved."""
+    loop = asyncio.get_running_loop()
+    unhandled: list[dict] = []
+    previous = loop.get_exception_handler()
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+
+    async def fake_fts(s, query, limit):
+        await asyncio.sleep(0.01)  # let the trigram task fail first
+        return [_make_chunk(i) for i in range(3)]
+
+    try:
+        with (
+            patch(f"{_MODULE}.search_fts", side_effect=fake_fts),
+            patch(f"{_MODULE}.search_trigram", side_effect=RuntimeError("db down")),
+        ):
+            results = await retrieve_chunks(
+                AsyncMock(), "query", min_fts_results=3, session_factory=_session_factory()
+            )
+        gc.collect()
+    finally:
+        loop.set_exception_handler(previous)
+
+    assert len(results) == 3
+    assert unhandled == []
+
+
+# ---------------------------------------------------------------------------
+# retrieve_chunks_sql (single-statement cascade)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_sql_single_round_trip(mock_db_session: AsyncMock) -> None:
+    """The whole cascade is one CTE statement; rows map to RetrievedChunk."""
+    row = _make_row(7, "acme", "repo", "src/a.py", "aaa", 1, 10, "def foo():", 0.42)
+    mock_db_session.execute.return_value = iter([row])
+
+    results = await retrieve_chunks_sql(mock_db_session, "how does foo work", max_chunks=5)
+
+    mock_db_session.execute.assert_awaited_once()
+    sql = str(mock_db_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    for cte in ("WITH fts AS", "fts_or AS", "fts_all AS", "tri AS"):
+        assert cte in sql
+    assert "DISTINCT ON (combined.id)" in sql
+    assert [(r.id, r.score, r.path) for r in results] == [(7, 0.42, "src/a.py")]
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_sql_skips_or_stage_without_words(
+    mock_db_session: AsyncMock,
+) -> None:
+    """No OR stage is built when the query has no searchable words."""
+    mock_db_session.execute.return_value = iter([])
+
+    assert await retrieve_chunks_sql(mock_db_session, "!@#$%") == []
+
+    sql = str(mock_db_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "fts_or" not in sql
+    assert "tri AS" in sql
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_speculative_or_cancelled_on_and_success(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The speculative OR query is cancelled once FTS-AND returns anything."""
+    monkeypatch.setattr(f"{_MODULE}._SPECULATIVE_OR_DELAY", 0.0)
+    or_started = asyncio.Event()
+    or_cancelled = asyncio.Event()
+
+    async def slow_or(s, query, limit):
+        or_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            or_cancelled.set()
+            raise
+        return []
+
+    async def fake_fts(s, query, limit):
+        await or_started.wait()
+        return [_make_chunk(1)]
+
+    with (
+        patch(f"{_MODULE}.search_fts", side_effect=fake_fts),
+        patch(f"{_MODULE}.search_fts_or", side_effect=slow_or),
+        patch(f"{_MODULE}.search_trigram", new_callable=AsyncMock, return_value=[]),
+    ):
+        results = await asyncio.wait_for(
+            retrieve_chunks(
+                AsyncMock(),
+                "query",
+                min_fts_results=1,
+                session_factory=_session_factory(),
+                speculative_or=True,
+            ),
+            timeout=1,
+        )
+
+    assert [r.id for r in results] == [1]
+    assert or_cancelled.is_set()
+
+
+@pytest.mark.anyio
+async def test_retrieve_chunks_speculative_or_used_when_and_empty(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """When FTS-AND is empty, the already-running OR query supplies the results."""
+    monkeypatch.setattr(f"{_MODULE}._SPECULATIVE_OR_DELAY", 0.0)
+    session = AsyncMock()
+    or_chunks = [_make_chunk(20), _make_chunk(21), _make_chunk(22)]
+    or_sessions = []
+
+    async def fake_or(s, query, limit):
+        or_sessions.append(s)
+        return or_chunks
+
+    with (
+        patch(f"{_MODULE}.search_fts", new_callable=AsyncMock, return_value=[]),
+        patch(f"{_MODULE}.search_fts_or", side_effect=fake_or),
+        patch(f"{_MODULE}.search_trigram", new_callable=AsyncMock, return_value=[]),
+    ):
+        results = await retrieve_chunks(
+            session,
+            "query",
+            min_fts_results=3,
+            session_factory=_session_factory(),
+            speculative_or=True,
+        )
+
+    assert results == or_chunks
+    assert len(or_sessions) == 1
+    assert or_sessions[0] is not session
@@ -16,8 +16,8 @@ async def test_in_memory_queue_enqueue() -> None:
 
     assert task_name == "fake-task-1"
     assert len(queue.tasks) == 1
-    assert queue.tasks[0]["url"] == "https://example.com/tasks/index-file"
-    assert queue.tasks[0]["payload"] == {"repo_id": 1, "path": "src/main.py"}
+    assert queue.tasks[0].url == "https://example.com/tasks/index-file"
+    assert queue.tasks[0].payload == {"repo_id": 1, "path": "src/main.py"}
 
 
 @pytest.mark.asyncio
@@ -5,6 +5,9 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from httpx import AsyncClient
 
+from app.services.query_cache import RetrievalCache
+from app.services.retrieval import RetrievedChunk
+
 
 @pytest.mark.anyio
 @patch("app.routers.tasks.index_file", new_callable=AsyncMock)
@@ -68,3 +71,49 @@ async def test_index_file_endpoint_error(mock_index, client: AsyncClient) -> Non
 
     assert response.status_code == 500
     assert "Failed to index file" in response.json()["detail"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ("endpoint", "target", "extra"),
+    [
+        ("/tasks/index-file", "app.routers.tasks.index_file", {"commit_sha": "abc123"}),
+        ("/tasks/delete-file", "app.routers.tasks.delete_file", {}),
+    ],
+    ids=["index", "delete"],
+)
+async def test_task_handlers_invalidate_retrieval_cache(
+    client: AsyncClient,
+    mock_db_session: AsyncMock,
+    retrieval_cache: RetrievalCache,
+    endpoint: str,
+    target: str,
+    extra: dict,
+) -> None:
+    """A successful index/delete commits, then drops cached retrieval results."""
+    chunk = RetrievedChunk(
+        id=1,
+        repo_owner="testuser",
+        repo_name="my-repo",
+        path="src/main.py",
+        commit_sha="old",
+        start_line=1,
+        end_line=10,
+        content="x",
+        score=0.5,
+    )
+    retrieval_cache.put("what does main do?", [chunk])
+    payload = {
+        "repo_owner": "testuser",
+        "repo_name": "my-repo",
+        "repo_id": 1,
+        "path": "src/main.py",
+        **extra,
+    }
+
+    with patch(target, new_callable=AsyncMock, return_value={"status": "ok"}):
+        response = await client.post(endpoint, json=payload)
+
+    assert response.status_code == 200
+    mock_db_session.commit.assert_awaited()
+    assert retrieval_cache.get("what does main do?") is None
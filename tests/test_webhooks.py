@@ -1,23 +1,13 @@
 """Tests for the GitHub webhook endpoint with HMAC-SHA256 signature verification."""
 
-import hashlib
-import hmac
 import json
+from dataclasses import dataclass
 
 import pytest
 from httpx import AsyncClient
 
 from app.services.task_queue import InMemoryTaskQueue
-
-
-def _sign(body: bytes, secret: str) -> str:
-    """Compute the GitHub-style HMAC-SHA256 signature for a payload."""
-    digest = hmac.new(
-        secret.encode("utf-8"),
-        msg=body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    return f"sha256={digest}"
+from tests.conftest import WEBHOOK_SECRET, sign_webhook
 
 
 def _make_push_payload(
@@ -77,50 +67,65 @@ def _make_push_payload(
     }
 
 
-WEBHOOK_SECRET = "dev-secret"
 ENDPOINT = "/webhooks/github"
 
 
+def _signed(payload: dict) -> tuple[bytes, str]:
+    """Encode a payload and sign it with the configured webhook secret."""
+    body = json.dumps(payload).encode()
+    return body, sign_webhook(body)
+
+
 # ---------------------------------------------------------------------------
 # Signature verification tests (existing from 02-01)
 # ---------------------------------------------------------------------------
 
 
 @pytest.mark.anyio
-async def test_webhook_valid_signature(client: AsyncClient) -> None:
-    """POST with correct HMAC-SHA256 signature returns 202 and accepted status."""
-    payload = _make_push_payload()
+async def test_webhook_valid_signature_large_body(client: AsyncClient) -> None:
+    """A ~1 MiB signed body verifies like a small one."""
+    payload = _make_push_payload(added=["src/big.py"])
+    payload["commits"][0]["message"] = "x" * (1 << 20)
     body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
 
     response = await client.post(
         ENDPOINT,
         content=body,
         headers={
             "Content-Type": "application/json",
-            "X-Hub-Signature-256": signature,
+            "X-Hub-Signature-256": sign_webhook(body),
         },
     )
 
+    assert len(body) > 1 << 20
     assert response.status_code == 202
-    data = response.json()
-    assert data["status"] == "accepted"
-    assert data["tasks_enqueued"] == 1
+    assert response.json()["tasks_enqueued"] == 1
 
 
 @pytest.mark.anyio
-async def test_webhook_invalid_signature(client: AsyncClient) -> None:
-    """POST with an incorrect signature returns 401."""
-    payload = _make_push_payload()
-    body = json.dumps(payload).encode()
-    bad_signature = _sign(body, "wrong-secret")
+@pytest.mark.parametrize(
+    "signature",
+    [
+        "",
+        "sha1=" + "0" * 40,
+        "sha256=" + "0" * 63,
+        "sha256=" + "z" * 64,
+        "sha256=" + "é" * 64,
+        "sha256=" + "0" * 62 + " 0",
+    ],
+    ids=["empty", "wrong_algo", "short", "non_hex", "non_ascii", "whitespace"],
+)
+async def test_webhook_malformed_signature(client: AsyncClient, signature: str) -> None:
+    """Malformed signature headers are rejected with 401, never a server error."""
+    body = json.dumps(_make_push_payload()).encode()
 
     response = await client.post(
         ENDPOINT,
         content=body,
+        # Raw bytes so non-ASCII values reach the app as-is.
         headers={
             "Content-Type": "application/json",
-            "X-Hub-Signature-256": bad_signature,
+            "X-Hub-Signature-256": signature.encode("utf-8"),
         },
     )
 
@@ -128,111 +133,117 @@ async def test_webhook_invalid_signature(client: AsyncClient) -> None:
 
 
 @pytest.mark.anyio
-async def test_webhook_missing_signature(client: AsyncClient) -> None:
-    """POST without X-Hub-Signature-256 header returns 422 (missing required header)."""
-    payload = _make_push_payload()
-    body = json.dumps(payload).encode()
+async def test_webhook_invalid_signature(client: AsyncClient) -> None:
+    """POST with an incorrect signature returns 401."""
+    body = json.dumps(_make_push_payload()).encode()
+    bad_signature = sign_webhook(body, "wrong-secret")
 
     response = await client.post(
         ENDPOINT,
         content=body,
-        headers={"Content-Type": "application/json"},
+        headers={
+            "Content-Type": "application/json",
+            "X-Hub-Signature-256": bad_signature,
+        },
     )
 
-    assert response.status_code == 422
+    assert response.status_code == 401
 
 
 @pytest.mark.anyio
-async def test_webhook_parses_push_payload(client: AsyncClient) -> None:
-    """POST with valid signature and multiple commits returns correct task count."""
-    payload = _make_push_payload(num_commits=3)
-    body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+async def test_webhook_signature_follows_secret_change(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The cached HMAC prototype never outlives a change of the configured secret."""
+    body = json.dumps(_make_push_payload()).encode()
 
-    response = await client.post(
-        ENDPOINT,
-        content=body,
-        headers={
+    def _headers(secret: str) -> dict[str, str]:
+        return {
             "Content-Type": "application/json",
-            "X-Hub-Signature-256": signature,
-        },
-    )
-
-    assert response.status_code == 202
-    data = response.json()
-    assert data["status"] == "accepted"
-    # 3 commits, each with 1 added file => 3 index tasks
-    assert data["tasks_enqueued"] == 3
+            "X-Hub-Signature-256": sign_webhook(body, secret),
+        }
 
+    first = await client.post(ENDPOINT, content=body, headers=_headers(WEBHOOK_SECRET))
+    monkeypatch.setattr("app.routers.webhooks.settings.github_webhook_secret", "rotated")
+    stale = await client.post(ENDPOINT, content=body, headers=_headers(WEBHOOK_SECRET))
+    fresh = await client.post(ENDPOINT, content=body, headers=_headers("rotated"))
 
-# ---------------------------------------------------------------------------
-# Task enqueue tests (new for 02-04)
-# ---------------------------------------------------------------------------
+    assert (first.status_code, stale.status_code, fresh.status_code) == (202, 401, 202)
 
 
 @pytest.mark.anyio
-async def test_webhook_enqueues_index_tasks(
-    client: AsyncClient, mock_task_queue: InMemoryTaskQueue,
-) -> None:
-    """Push with 2 added files enqueues 2 index tasks."""
-    payload = _make_push_payload(added=["src/a.py", "src/b.py"])
-    body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+async def test_webhook_missing_signature(client: AsyncClient) -> None:
+    """POST without X-Hub-Signature-256 header returns 422 (missing required header)."""
+    body = json.dumps(_make_push_payload()).encode()
 
     response = await client.post(
         ENDPOINT,
         content=body,
-        headers={
-            "Content-Type": "application/json",
-            "X-Hub-Signature-256": signature,
-        },
+        headers={"Content-Type": "application/json"},
     )
 
-    assert response.status_code == 202
-    assert len(mock_task_queue.tasks) == 2
-    for task in mock_task_queue.tasks:
-        assert "/tasks/index-file" in task["url"]
-        assert task["payload"]["repo_id"] == 12345
-        assert task["payload"]["commit_sha"] == "abc0000"
+    assert response.status_code == 422
 
 
-@pytest.mark.anyio
-async def test_webhook_enqueues_delete_tasks(
-    client: AsyncClient, mock_task_queue: InMemoryTaskQueue,
-) -> None:
-    """Push with 1 removed file enqueues 1 delete task."""
-    payload = _make_push_payload(removed=["old_file.py"])
-    body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+# ---------------------------------------------------------------------------
+# Task enqueue tests (new for 02-04)
+# ---------------------------------------------------------------------------
 
-    response = await client.post(
-        ENDPOINT,
-        content=body,
-        headers={
-            "Content-Type": "application/json",
-            "X-Hub-Signature-256": signature,
-        },
-    )
 
-    assert response.status_code == 202
-    assert len(mock_task_queue.tasks) == 1
-    task = mock_task_queue.tasks[0]
-    assert "/tasks/delete-file" in task["url"]
-    assert task["payload"]["path"] == "old_file.py"
+@dataclass(frozen=True)
+class _PushCase:
+    """A push payload and the file paths it should enqueue per task endpoint."""
+
+    payload: dict
+    expected_paths: dict[str, list[str]]
+
+
+_INDEX = "/tasks/index-file"
+_DELETE = "/tasks/delete-file"
+
+_PUSH_CASES = [
+    pytest.param(
+        # One commit, one added file => one index task
+        _PushCase(_make_push_payload(), {_INDEX: ["file0.py"]}),
+        id="valid_signature",
+    ),
+    pytest.param(
+        # 3 commits, each with 1 added file => 3 index tasks
+        _PushCase(
+            _make_push_payload(num_commits=3),
+            {_INDEX: ["file0.py", "file1.py", "file2.py"]},
+        ),
+        id="multi_commit",
+    ),
+    pytest.param(
+        _PushCase(
+            _make_push_payload(added=["src/a.py", "src/b.py"]),
+            {_INDEX: ["src/a.py", "src/b.py"]},
+        ),
+        id="index_tasks",
+    ),
+    pytest.param(
+        _PushCase(_make_push_payload(removed=["old_file.py"]), {_DELETE: ["old_file.py"]}),
+        id="delete_tasks",
+    ),
+    pytest.param(
+        # added + modified => index tasks, removed => delete task
+        _PushCase(
+            _make_push_payload(added=["new.py"], modified=["changed.py"], removed=["deleted.py"]),
+            {_INDEX: ["new.py", "changed.py"], _DELETE: ["deleted.py"]},
+        ),
+        id="mixed_operations",
+    ),
+]
 
 
 @pytest.mark.anyio
-async def test_webhook_mixed_operations(
-    client: AsyncClient, mock_task_queue: InMemoryTaskQueue,
+@pytest.mark.parametrize("case", _PUSH_CASES)
+async def test_webhook_accepted_push_enqueues_tasks(
+    client: AsyncClient, mock_task_queue: InMemoryTaskQueue, case: _PushCase
 ) -> None:
-    """Push with added + modified + removed files enqueues correct task types."""
-    payload = _make_push_payload(
-        added=["new.py"],
-        modified=["changed.py"],
-        removed=["deleted.py"],
-    )
-    body = json.dumps(payload).encode()
-    signature = _sign(body, WEBHOOK_SECRET)
+    """A validly signed push returns 202 and enqueues one task per touched file."""
+    body, signature = _signed(case.payload)
 
     response = await client.post(
         ENDPOINT,
@@ -244,15 +255,18 @@ async def test_webhook_mixed_operations(
     )
 
     assert response.status_code == 202
-    data = response.json()
-    assert data["tasks_enqueued"] == 3
-
-    # 2 index tasks (added + modified) and 1 delete task
-    index_tasks = [t for t in mock_task_queue.tasks if "/index-file" in t["url"]]
-    delete_tasks = [t for t in mock_task_queue.tasks if "/delete-file" in t["url"]]
-    assert len(index_tasks) == 2
-    assert len(delete_tasks) == 1
-
-    index_paths = {t["payload"]["path"] for t in index_tasks}
-    assert index_paths == {"new.py", "changed.py"}
-    assert delete_tasks[0]["payload"]["path"] == "deleted.py"
+    assert response.json() == {
+        "status": "accepted",
+        "tasks_enqueued": sum(map(len, case.expected_paths.values())),
+    }
+
+    enqueued: dict[str, list[str]] = {}
+    for task in mock_task_queue.tasks:
+        assert task.payload["repo_id"] == 12345
+        if task.url.endswith(_INDEX):
+            assert task.payload["commit_sha"] == "abc0000"
+            enqueued.setdefault(_INDEX, []).append(task.payload["path"])
+        else:
+            assert task.url.endswith(_DELETE)
+            enqueued.setdefault(_DELETE, []).append(task.payload["path"])
+    assert enqueued == case.expected_paths